@@ -0,0 +1,179 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import json
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from app_config import db
+from models import Artist
+from payloads import venue_search_results, artist_search_results, venue_detail, artist_detail, show_listing
+from queries import venue_areas, shows_page, free_slots
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api = Blueprint('api', __name__, url_prefix='/api')
+
+
+# ----------------------------------------------------------------------------#
+# Serialization.
+# ----------------------------------------------------------------------------#
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def dumps(payload):
+    # orjson when installed, the stdlib otherwise; datetimes become ISO 8601
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def requested_fields():
+    # ?fields=id,name -> {'id', 'name'}; None means every field
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(',') if field.strip()}
+
+
+def requested_page():
+    # ?page=&limit= for the search endpoints; 400 if either is below 1
+    page = request.args.get('page', 1, type=int)
+    page_size = min(request.args.get('limit', current_app.config['SEARCH_PAGE_SIZE'], type=int),
+                    current_app.config['SEARCH_MAX_PAGE_SIZE'])
+    if page < 1 or page_size < 1:
+        abort(400)
+    return page, page_size, current_app.config['SEARCH_EXACT_COUNT_LIMIT']
+
+
+def sparse(item, fields):
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
+
+
+def requested_window():
+    # ?start=&end= as ISO 8601 (a bare date is midnight); 400 if missing,
+    # malformed, reversed or wider than FREE_SLOTS_MAX_WINDOW_DAYS
+    try:
+        start = datetime.fromisoformat(request.args['start'])
+        end = datetime.fromisoformat(request.args['end'])
+    except (KeyError, ValueError):
+        abort(400)
+    max_days = current_app.config['FREE_SLOTS_MAX_WINDOW_DAYS']
+    if start >= end or end - start > timedelta(days=max_days):
+        abort(400)
+    return start, end
+
+
+def requested_min_length():
+    minutes = request.args.get('min_minutes', type=int)
+    return timedelta(minutes=minutes) if minutes else None
+
+
+def slot_list(slots):
+    return [{"start": slot_start, "end": slot_end} for slot_start, slot_end in slots]
+
+
+# ----------------------------------------------------------------------------#
+# Endpoints.
+#
+# Same data paths as the HTML views. ?fields= applies to the primary objects:
+# the entity on detail endpoints, each result/show/venue on list endpoints.
+# ----------------------------------------------------------------------------#
+
+@api.route('/venues')
+def venues():
+    fields = requested_fields()
+    areas = venue_areas()
+    for area in areas:
+        area['venues'] = [sparse(venue, fields) for venue in area['venues']]
+    return json_response({"areas": areas})
+
+
+@api.route('/venues/search')
+def search_venues():
+    results = venue_search_results(request.args.get('search_term', ''), *requested_page())
+    results['data'] = [sparse(venue, requested_fields()) for venue in results['data']]
+    return json_response(results)
+
+
+@api.route('/venues/<int:venue_id>')
+def show_venue(venue_id):
+    venue = venue_detail(venue_id)
+    if venue is None:
+        abort(404)
+    return json_response(sparse(venue, requested_fields()))
+
+
+@api.route('/artists/search')
+def search_artists():
+    results = artist_search_results(request.args.get('search_term', ''), *requested_page())
+    results['data'] = [sparse(artist, requested_fields()) for artist in results['data']]
+    return json_response(results)
+
+
+@api.route('/artists/<int:artist_id>')
+def show_artist(artist_id):
+    artist = artist_detail(artist_id)
+    if artist is None:
+        abort(404)
+    return json_response(sparse(artist, requested_fields()))
+
+
+@api.route('/artists/<int:artist_id>/free')
+def artist_free_slots(artist_id):
+    start, end = requested_window()
+    results = free_slots(start, end, artist_ids=[artist_id], min_length=requested_min_length())
+    # no slots is either a busy artist or an unknown one
+    if not results and db.session.query(Artist.id).filter(Artist.id == artist_id).scalar() is None:
+        abort(404)
+    return json_response({
+        "artist_id": artist_id,
+        "start": start,
+        "end": end,
+        "free": slot_list(results[0][2]) if results else []
+    })
+
+
+@api.route('/availability/free')
+def free_artists():
+    # everyone free in the window (or just the repeated ?artist_id=), e.g. for one night
+    start, end = requested_window()
+    artist_ids = request.args.getlist('artist_id', type=int) or None
+    results = free_slots(start, end, artist_ids=artist_ids, min_length=requested_min_length())
+    return json_response({
+        "start": start,
+        "end": end,
+        "artists": [{"artist_id": artist_id, "artist_name": artist_name, "free": slot_list(slots)}
+                    for artist_id, artist_name, slots in results]
+    })
+
+
+@api.route('/shows')
+def shows():
+    page_size = min(request.args.get('limit', current_app.config['SHOWS_PAGE_SIZE'], type=int),
+                    current_app.config['SHOWS_MAX_PAGE_SIZE'])
+    if page_size < 1:
+        abort(400)
+    try:
+        show_query, next_cursor = shows_page(after=request.args.get('after'), page_size=page_size)
+    except ValueError:
+        abort(400)
+    fields = requested_fields()
+    return json_response({
+        "data": [sparse(show_listing(show), fields) for show in show_query],
+        "next_cursor": next_cursor
+    })
@@ -1,14 +1,80 @@
+import logging
+import os
+from logging import Formatter, FileHandler
+
 from flask import Flask
-from flask_migrate import Migrate
 from flask_moment import Moment
 from flask_sqlalchemy import SQLAlchemy
 
+from page_cache import PageCache
+from tasks import PostCommitTasks
+
+# ----------------------------------------------------------------------------#
+# Extensions.
+#
+# Created unbound so models and queries can import db without an app; the
+# factory below binds them.
+# ----------------------------------------------------------------------------#
+
+moment = Moment()
+db = SQLAlchemy()
+page_cache = PageCache()
+post_commit = PostCommitTasks()
+
+
 # ----------------------------------------------------------------------------#
 # App Config.
 # ----------------------------------------------------------------------------#
 
-app = Flask(__name__)
-moment = Moment(app)
-app.config.from_object('config')
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+def create_app(config_object='config'):
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+    moment.init_app(app)
+    db.init_app(app)
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        # only the `flask db` commands need Flask-Migrate, and importing it
+        # pulls in alembic: about a third of a worker's import time
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    page_cache.init_app(app)
+    post_commit.init_app(app, db)
+
+    # imported here: the views import the models, which import db from this
+    # module, and anything only some processes need stays out of the import
+    from filters import format_datetime
+    app.jinja_env.filters['datetime'] = format_datetime
+
+    if app.config['INSTRUMENTATION_ENABLED']:
+        from instrumentation import init_instrumentation
+        init_instrumentation(app)
+
+    import pages
+    import venues
+    import artists
+    import shows
+    import availability
+    from api import api
+    for blueprint in (pages.blueprint, venues.blueprint, artists.blueprint, shows.blueprint,
+                      availability.blueprint, api):
+        app.register_blueprint(blueprint)
+
+    from assets import init_assets
+    init_assets(app)
+
+    from commands import register_commands
+    register_commands(app)
+
+    if not app.debug:
+        init_logging(app)
+    return app
+
+
+def init_logging(app):
+    file_handler = FileHandler('error.log')
+    file_handler.setFormatter(
+        Formatter('%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]')
+    )
+    app.logger.setLevel(logging.INFO)
+    file_handler.setLevel(logging.INFO)
+    app.logger.addHandler(file_handler)
+    app.logger.info('errors')
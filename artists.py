@@ -0,0 +1,192 @@
+import sys
+
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort, current_app
+
+from app_config import db, page_cache, post_commit
+from deletion import delete_artist_cascade
+from genre_cache import resolve_genres
+from instrumentation import StatementBudgetExceeded
+from invalidation import invalidate_artist_listings
+from locations import resolve_location
+from models import Artist
+from payloads import artist_search_results, artist_detail
+from suggest import suggest_put, suggest_discard
+
+blueprint = Blueprint('artists', __name__)
+
+
+#  Artists
+#  ----------------------------------------------------------------
+
+@blueprint.route('/artists')
+def artists():
+    # TODO: replace with real data returned from querying the database
+    artist_list = Artist.query.all()
+    data = []
+    for artist in artist_list:
+        data.append({
+            "id": artist.id,
+            "name": artist.name,
+        })
+    return render_template('pages/artists.html', artists=data)
+
+
+@blueprint.route('/artists/search', methods=['GET', 'POST'])
+def search_artists():
+    # TODO: implement search on artists with partial string search. Ensure it is case-insensitive.
+    # seach for "A" should return "Guns N Petals", "Matt Quevado", and "The Wild Sax Band".
+    # search for "band" should return "The Wild Sax Band".
+    # the form POSTs the first page, the pager links GET the others
+    search_term = request.values.get('search_term', '')
+    page = request.values.get('page', 1, type=int)
+    page_size = min(request.values.get('limit', current_app.config['SEARCH_PAGE_SIZE'], type=int),
+                    current_app.config['SEARCH_MAX_PAGE_SIZE'])
+    if page < 1 or page_size < 1:
+        abort(400)
+    response = artist_search_results(search_term, page, page_size, current_app.config['SEARCH_EXACT_COUNT_LIMIT'])
+    return render_template('pages/search_artists.html', results=response,
+                           search_term=search_term)
+
+
+@blueprint.route('/artists/<int:artist_id>')
+@page_cache.cached('artist', 'artist_id')
+def show_artist(artist_id):
+    # shows the artist page with the given artist_id
+    # TODO: replace with real artist data from the artist table, using artist_id
+    artist = artist_detail(artist_id)
+    if artist is None:
+        abort(404)
+    return render_template('pages/show_artist.html', artist=artist)
+
+
+@blueprint.route('/artists/<int:artist_id>', methods=['POST'])
+def delete_artist(artist_id):
+    error = False
+    # shows, availability and genre rows go with bulk deletes, see deletion.py
+    try:
+        venue_ids = delete_artist_cascade(artist_id)
+        if venue_ids is not None:
+            page_cache.bump('artist', artist_id)
+            post_commit.submit(invalidate_artist_listings, artist_id, venue_ids)
+            suggest_discard('artist', artist_id)
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        error = True
+        db.session.rollback()
+        print(sys.exc_info())
+    finally:
+        db.session.close()
+    if error:
+        abort(400)
+    if venue_ids is None:
+        abort(404)
+    return redirect(url_for('pages.index'))
+
+
+#  Update
+#  ----------------------------------------------------------------
+
+@blueprint.route('/artists/<int:artist_id>/edit', methods=['GET'])
+def edit_artist(artist_id):
+    from forms import ArtistForm
+    artist = Artist.query.get(artist_id)
+    artist_genres_query = list(artist.genres)
+    artist_genres_list = []
+    for genres in artist_genres_query:
+        artist_genres_list.append(genres.name)
+    artist_form_data = {
+        "id": artist.name,
+        "name": artist.name,
+        "genres": artist_genres_list,
+        "city": artist.city,
+        "state": artist.state,
+        "phone": artist.phone,
+        "website": artist.website_link,
+        "facebook_link": artist.facebook_link,
+        "seeking_venue": artist.seeking_venue,
+        "seeking_description": artist.seeking_description,
+        "image_link": artist.image_link
+    }
+    form = ArtistForm(data=artist_form_data)
+    # TODO: populate form with fields from artist with ID <artist_id>
+    return render_template('forms/edit_artist.html', form=form, artist=artist)
+
+
+@blueprint.route('/artists/<int:artist_id>/edit', methods=['POST'])
+def edit_artist_submission(artist_id):
+    # TODO: take values from the form submitted, and update existing
+    # artist record with ID <artist_id> using the new attributes
+    try:
+        artist = Artist.query.get(artist_id)
+        artist.name = request.form.get('name')
+        artist.location = resolve_location(request.form.get('city'), request.form.get('state'))
+        artist.phone = request.form.get('phone')
+        artist.facebook_link = request.form.get('facebook_link')
+        artist.image_link = request.form.get('image_link')
+        artist.website_link = request.form.get('website_link')
+        artist.seeking_venue = True if request.form.get('seeking_venue') else False
+        artist.seeking_description = request.form.get('seeking_description')
+        artist.genres = resolve_genres(request.form.getlist('genres'))
+        post_commit.add(invalidate_artist_listings, artist_id)
+        db.session.commit()
+        page_cache.bump('artist', artist_id)
+        suggest_put('artist', artist)
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        # TODO: on unsuccessful db insert, flash an error instead.
+        print(sys.exc_info())
+        # e.g., flash('An error occurred. Venue ' + data.name + ' could not be listed.')
+        # flash('An error occurred. Venue ' + request.form.get('name') + ' could not be listed.')
+        # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+    finally:
+        db.session.close()
+
+    return redirect(url_for('artists.show_artist', artist_id=artist_id))
+
+
+#  Create Artist
+#  ----------------------------------------------------------------
+
+@blueprint.route('/artists/create', methods=['GET'])
+def create_artist_form():
+    from forms import ArtistForm
+    form = ArtistForm()
+    return render_template('forms/new_artist.html', form=form)
+
+
+@blueprint.route('/artists/create', methods=['POST'])
+def create_artist_submission():
+    # called upon submitting the new artist listing form
+    # TODO: insert form data as a new Venue record in the db, instead
+    # TODO: modify data to be the data object returned from db insertion
+    try:
+        artist = Artist(name=request.form.get('name'),
+                        location=resolve_location(request.form.get('city'), request.form.get('state')),
+                        phone=request.form.get('phone'),
+                        facebook_link=request.form.get('facebook_link'),
+                        image_link=request.form.get('image_link'),
+                        website_link=request.form.get('website_link'),
+                        seeking_venue=True if request.form.get('seeking_venue') else False,
+                        seeking_description=request.form.get('seeking_description'))
+        artist.genres = resolve_genres(request.form.getlist('genres'))
+        db.session.add(artist)
+        db.session.commit()
+        page_cache.invalidate_fragment('recent_artists')
+        suggest_put('artist', artist)
+        # on successful db insert, flash success
+        flash('Artist ' + request.form['name'] + ' was successfully listed!')
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        # TODO: on unsuccessful db insert, flash an error instead.
+        # e.g., flash('An error occurred. Venue ' + data.name + ' could not be listed.')
+        flash('An error occurred. Artist ' + request.form.get('name') + ' could not be listed.')
+        # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+    finally:
+        db.session.close()
+    return render_template('pages/home.html')
@@ -0,0 +1,187 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory
+
+# ----------------------------------------------------------------------------#
+# Static asset pipeline.
+#
+# `flask build-assets` bundles and minifies what layouts/main.html loads,
+# writes content-hashed copies to static/dist with .gz/.br siblings, renders
+# resized WebP/JPEG variants of the home page splash image and records it all
+# in static/dist/manifest.json. brotli and Pillow are optional and only
+# imported by the build, which warns about what it skipped without them.
+# When the manifest exists, url_for('static') resolves logical names to the
+# hashed files, which are served precompressed with a far-future
+# Cache-Control.
+# ----------------------------------------------------------------------------#
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+FAR_FUTURE = 365 * 24 * 60 * 60
+
+# logical bundle name -> sources (relative to static/), in load order
+BUNDLES = {
+    'bundles/main.css': ['css/bootstrap.min.css', 'css/layout.main.css', 'css/main.css',
+                         'css/main.responsive.css', 'css/main.quickfix.css'],
+    'bundles/head.js': ['js/libs/modernizr-2.8.2.min.js', 'js/libs/moment.min.js'],
+    'bundles/app.js': ['js/script.js', 'js/libs/bootstrap-3.1.1.min.js', 'js/plugins.js'],
+}
+# files referenced on their own, hashed as-is
+SINGLE_FILES = ['img/front-splash.jpg', 'js/libs/jquery-1.11.1.min.js', 'js/libs/respond-1.4.2.min.js']
+SPLASH_IMAGE = 'img/front-splash.jpg'
+SPLASH_WIDTHS = (480, 960, 1440)
+COMPRESSIBLE = ('.css', '.js', '.svg')
+# optional build module -> (pip package, what the build skips without it)
+OPTIONAL_MODULES = {
+    'brotli': ('brotli', 'no .br files, browsers get gzip'),
+    'PIL': ('Pillow', 'no resized splash image variants, the home page uses the original'),
+}
+
+
+# ----------------------------------------------------------------------------#
+# Build.
+# ----------------------------------------------------------------------------#
+
+def minify_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    # only drops blank lines and trailing whitespace: the libraries are shipped
+    # minified and a regex can't safely minify arbitrary JavaScript
+    return '\n'.join(line.rstrip() for line in text.splitlines() if line.strip()) + '\n'
+
+
+def missing_build_modules():
+    # [(pip package, what is skipped)] for the optional modules not installed
+    return [OPTIONAL_MODULES[name] for name in sorted(OPTIONAL_MODULES)
+            if importlib.util.find_spec(name) is None]
+
+
+def read_source(static_folder, name):
+    with open(os.path.join(static_folder, name), encoding='utf-8') as source:
+        text = source.read()
+    if name.endswith('.min.css') or name.endswith('.min.js'):
+        return text
+    return minify_css(text) if name.endswith('.css') else minify_js(text)
+
+
+def write_hashed(static_folder, logical_name, data):
+    # writes data straight under dist/ (one level down, like css/, so relative
+    # url(../fonts/...) references keep working) with a content hash in the
+    # name, plus .gz/.br for text assets; returns the path relative to static/
+    root, ext = os.path.splitext(os.path.basename(logical_name))
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    relative = '{}/{}.{}{}'.format(DIST_DIR, root, digest, ext)
+    path = os.path.join(static_folder, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as output:
+        output.write(data)
+    if ext in COMPRESSIBLE:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        with open(path + '.gz', 'wb') as output:
+            output.write(gzip.compress(data, compresslevel=9))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as output:
+                output.write(brotli.compress(data, quality=11))
+    return relative
+
+
+def build_splash_variants(static_folder, manifest):
+    # returns the widths rendered (none without Pillow); never upscales
+    try:
+        from PIL import Image
+    except ImportError:
+        return []
+    source = Image.open(os.path.join(static_folder, SPLASH_IMAGE)).convert('RGB')
+    root, _ = os.path.splitext(SPLASH_IMAGE)
+    widths = [width for width in SPLASH_WIDTHS if width <= source.width]
+    for width in widths:
+        resized = source.resize((width, round(source.height * width / source.width)), Image.LANCZOS)
+        for fmt, ext, options in (('WEBP', '.webp', {'quality': 80, 'method': 6}),
+                                  ('JPEG', '.jpg', {'quality': 80, 'optimize': True, 'progressive': True})):
+            variant = io.BytesIO()
+            resized.save(variant, fmt, **options)
+            logical_name = '{}-{}{}'.format(root, width, ext)
+            manifest[logical_name] = write_hashed(static_folder, logical_name, variant.getvalue())
+    return widths
+
+
+def build_assets(static_folder):
+    # returns the manifest written to static/dist/manifest.json
+    manifest = {}
+    for logical_name, sources in BUNDLES.items():
+        separator = '\n' if logical_name.endswith('.css') else '\n;\n'
+        data = separator.join(read_source(static_folder, name) for name in sources).encode('utf-8')
+        manifest[logical_name] = write_hashed(static_folder, logical_name, data)
+    for name in SINGLE_FILES:
+        with open(os.path.join(static_folder, name), 'rb') as source:
+            manifest[name] = write_hashed(static_folder, name, source.read())
+    manifest['splash_variants'] = build_splash_variants(static_folder, manifest)
+    with open(os.path.join(static_folder, DIST_DIR, MANIFEST), 'w') as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+    return manifest
+
+
+# ----------------------------------------------------------------------------#
+# Serving.
+# ----------------------------------------------------------------------------#
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST)) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_assets(app):
+    manifest = load_manifest(app.static_folder)
+    hashed_files = {value for value in manifest.values() if isinstance(value, str)}
+    serve_original = app.view_functions['static']
+
+    @app.url_defaults
+    def hashed_static_filename(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]
+
+    @app.context_processor
+    def asset_context():
+        return {'static_bundles': bool(manifest),
+                'splash_widths': manifest.get('splash_variants', [])}
+
+    def serve_static(filename):
+        if filename not in hashed_files:
+            return serve_original(filename=filename)
+        response = None
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding in request.accept_encodings and \
+                    os.path.exists(os.path.join(app.static_folder, filename + suffix)):
+                response = send_from_directory(app.static_folder, filename + suffix,
+                                               mimetype=mimetypes.guess_type(filename)[0])
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = serve_original(filename=filename)
+        if filename.endswith(COMPRESSIBLE):
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'public, max-age={}, immutable'.format(FAR_FUTURE)
+        return response
+
+    app.view_functions['static'] = serve_static
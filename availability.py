@@ -0,0 +1,69 @@
+import sys
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, flash, redirect, url_for
+from sqlalchemy.exc import IntegrityError
+
+from app_config import db, page_cache
+from instrumentation import StatementBudgetExceeded
+from models import Artist, Availability
+from queries import overlap_filter
+
+blueprint = Blueprint('availability', __name__)
+
+
+#  Availability
+#  ----------------------------------------------------------------
+
+@blueprint.route('/artists/<int:artist_id>/availability/create', methods=['GET'])
+def create_availability(artist_id):
+    # renders form. do not touch.
+    from forms import AvailabilityForm
+    form = AvailabilityForm()
+    return render_template('forms/new_availability.html', form=form)
+
+
+@blueprint.route('/artists/<int:artist_id>/availability/create', methods=['POST'])
+def availability_submission(artist_id):
+    # renders form. do not touch.
+    from forms import AvailabilityForm
+    artist = Artist.query.get(artist_id)
+    start_at_form = request.form.get('start_at')
+    end_at_form = request.form.get('end_at')
+    try:
+        start_at = datetime.strptime(start_at_form, '%Y-%m-%d %H:%M:%S')
+        end_at = datetime.strptime(end_at_form, '%Y-%m-%d %H:%M:%S')
+        if start_at <= end_at:
+            availability_collide = Availability.query.filter(Availability.artist_id == artist.id,
+                                                             overlap_filter(Availability.start_at, Availability.end_at,
+                                                                            start_at, end_at)).first()
+            if not availability_collide:
+                availability = Availability(artist_id=artist.id, start_at=start_at, end_at=end_at)
+                db.session.add(availability)
+                db.session.commit()
+                page_cache.bump('artist', artist_id)
+                db.session.close()
+                # on successful db insert, flash success
+                flash('Availability was successfully listed!')
+                redirect(url_for('pages.index'))
+            else:
+                flash('Availability Collide!')
+        else:
+            flash('Start Time is less than equal to End time')
+    except IntegrityError:
+        db.session.rollback()
+        flash('Availability Collide!')
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        print(sys.exc_info())
+        flash('Availability was not listed!')
+        pass
+    finally:
+        db.session.close()
+    form = AvailabilityForm(data={
+        'start_at': start_at_form,
+        'end_at': end_at_form,
+    })
+    return render_template('forms/new_availability.html', form=form)
@@ -0,0 +1,3 @@
+# Benchmark suite: synthetic data generator (datagen), per-route latency and
+# SQL statement benchmarks (routes) and micro-benchmarks. Everything runs
+# against the database configured for the app (DATABASE_URL).
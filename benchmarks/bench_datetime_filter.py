@@ -0,0 +1,53 @@
+# ----------------------------------------------------------------------------#
+# Micro-benchmark: the `datetime` Jinja filter before and after pattern caching.
+#
+#   python benchmarks/bench_datetime_filter.py [--shows 10000] [--repeat 5]
+# ----------------------------------------------------------------------------#
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import babel.dates
+import dateutil.parser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filters import format_datetime  # noqa: E402
+
+
+def legacy_format_datetime(value, format='medium'):
+    # the filter as it was: views passed str(datetime), re-parsed on every call
+    date = dateutil.parser.parse(value)
+    if format == 'full':
+        format = "EEEE MMMM, d, y 'at' h:mma"
+    elif format == 'medium':
+        format = "EE MM, dd, y h:mma"
+    return babel.dates.format_datetime(date, format, locale='en')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime(2026, 1, 1, 20, 0)
+    start_times = [start + timedelta(hours=7 * i) for i in range(args.shows)]
+    start_strings = [str(value) for value in start_times]
+    assert [legacy_format_datetime(value, 'full') for value in start_strings[:100]] == \
+        [format_datetime(value, 'full') for value in start_times[:100]]
+
+    legacy = min(timeit.repeat(lambda: [legacy_format_datetime(value, 'full') for value in start_strings],
+                               number=1, repeat=args.repeat))
+    current = min(timeit.repeat(lambda: [format_datetime(value, 'full') for value in start_times],
+                                number=1, repeat=args.repeat))
+    print('shows: {}'.format(args.shows))
+    print('legacy filter (str + dateutil + babel): {:.3f}s  {:,.0f} shows/s'.format(legacy, args.shows / legacy))
+    print('cached pattern filter (datetime):       {:.3f}s  {:,.0f} shows/s'.format(current, args.shows / current))
+    print('speedup: {:.1f}x'.format(legacy / current))
+
+
+if __name__ == '__main__':
+    main()
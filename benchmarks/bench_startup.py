@@ -0,0 +1,92 @@
+# ----------------------------------------------------------------------------#
+# Cold start of a worker process.
+#
+#   python -m benchmarks.bench_startup --output startup.json
+#   git checkout <older commit> && python -m benchmarks.bench_startup --compare startup.json
+#
+# Each run is a fresh interpreter that imports app (building the app) and
+# serves one request that needs no database, like a worker's first request.
+# Reports the median wall time of the process, the import and first-request
+# times measured inside it, how many modules were loaded and which of the
+# heavy optional ones the import alone pulled in.
+# ----------------------------------------------------------------------------#
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['babel', 'dateutil', 'wtforms', 'flask_wtf', 'PIL', 'brotli']
+FIRST_REQUEST = '/shows/create'
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+heavy_at_import = [name for name in {heavy!r} if name in sys.modules]
+status = app.test_client().get({path!r}).status_code
+served = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'first_request_ms': (served - imported) * 1000,
+    'status': status,
+    'modules': len(sys.modules),
+    'heavy_at_import': heavy_at_import,
+}}))
+'''
+
+
+def run_once(path):
+    child = CHILD.format(path=path, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    output = subprocess.check_output([sys.executable, '-c', child], cwd=ROOT)
+    wall_ms = (time.perf_counter() - started) * 1000
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    result['wall_ms'] = wall_ms
+    return result
+
+
+def run(runs=20, path=FIRST_REQUEST):
+    results = [run_once(path) for _ in range(runs)]
+    report = {key: round(statistics.median(result[key] for result in results), 3)
+              for key in ('wall_ms', 'import_ms', 'first_request_ms')}
+    report.update({
+        'runs': runs,
+        'path': path,
+        'status': results[-1]['status'],
+        'modules': results[-1]['modules'],
+        'heavy_loaded': results[-1]['heavy_at_import'],
+    })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--path', default=FIRST_REQUEST, help='first request to serve')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report from another run to diff against')
+    args = parser.parse_args()
+
+    report = run(runs=args.runs, path=args.path)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as compare_file:
+            baseline = json.load(compare_file)
+    for key in ('wall_ms', 'import_ms', 'first_request_ms', 'modules'):
+        line = '{:<18} {:>10.2f}'.format(key, report[key])
+        if baseline:
+            line += '  (baseline {:.2f}, {:+.2f})'.format(baseline[key], report[key] - baseline[key])
+        print(line)
+    print('{:<18} {}'.format('heavy modules', ', '.join(report['heavy_loaded']) or 'none'))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
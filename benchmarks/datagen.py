@@ -0,0 +1,149 @@
+# ----------------------------------------------------------------------------#
+# Seeded synthetic data generator.
+#
+#   DATABASE_URL=sqlite:///bench.db python -m benchmarks.datagen --scale 1k --create-all
+#
+# Fills Genres, Location, Artist, Venue, the genre maps, Availability and Show with bulk
+# inserts. The same --scale and --seed always produce the same rows.
+# ----------------------------------------------------------------------------#
+import argparse
+import itertools
+import random
+import sys
+from datetime import datetime, timedelta
+
+from app import app
+from app_config import db
+from commands import initial_genres
+from counters import rebuild_show_counters
+from models import Venue, Genres, Artist, Show, Availability, Location, artist_genres_map, venue_genres_map
+
+SCALES = {
+    '1k': 1000,
+    '100k': 100000,
+    '1m': 1000000,
+}
+SHOWS_PER_ARTIST = 20
+SHOWS_PER_VENUE = 50
+CHUNK_SIZE = 10000
+STATES = ['CA', 'NY', 'TX', 'WA', 'IL', 'LA', 'FL', 'MA', 'CO', 'TN']
+CITIES = ['San Francisco', 'New York', 'Austin', 'Seattle', 'Chicago', 'New Orleans', 'Miami', 'Boston',
+          'Denver', 'Nashville', 'Portland', 'Springfield']
+WORDS = ['The', 'Wild', 'Sax', 'Band', 'Musical', 'Hop', 'Guns', 'Petals', 'Park', 'Square', 'Live',
+         'Music', 'Coffee', 'Dueling', 'Pianos', 'Bar', 'Quevado', 'Electric', 'Velvet', 'Echo']
+
+
+def bulk_insert(table, rows):
+    for offset in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(table.insert(), rows[offset:offset + CHUNK_SIZE])
+        db.session.commit()
+
+
+def entity_name(rng, index):
+    return '{} {} {}'.format(rng.choice(WORDS), rng.choice(WORDS), index)
+
+
+def place(rng, location_ids):
+    return location_ids[(rng.choice(CITIES), rng.choice(STATES))]
+
+
+def generate(num_shows, seed=42, now=None):
+    rng = random.Random(seed)
+    now = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+    num_artists = max(1, num_shows // SHOWS_PER_ARTIST)
+    num_venues = max(1, num_shows // SHOWS_PER_VENUE)
+
+    initial_genres()
+    genre_ids = [genre_id for genre_id, in db.session.query(Genres.id).order_by(Genres.id)]
+
+    locations = [{'id': index, 'city': city, 'state': state}
+                 for index, (city, state) in enumerate(itertools.product(CITIES, STATES), 1)]
+    location_ids = {(location['city'], location['state']): location['id'] for location in locations}
+    bulk_insert(Location.__table__, locations)
+
+    artists = []
+    venues = []
+    for index in range(1, num_artists + 1):
+        artists.append({
+            'id': index, 'name': entity_name(rng, index), 'location_id': place(rng, location_ids),
+            'phone': '555-{:04d}'.format(index % 10000),
+            'image_link': 'https://example.com/artists/{}.jpg'.format(index),
+            'facebook_link': 'https://www.facebook.com/artist{}'.format(index),
+            'website_link': 'https://example.com/artists/{}'.format(index),
+            'seeking_venue': rng.random() < 0.5,
+            'seeking_description': 'Looking for shows ' * rng.randint(1, 20),
+        })
+    for index in range(1, num_venues + 1):
+        venues.append({
+            'id': index, 'name': entity_name(rng, index), 'location_id': place(rng, location_ids),
+            'address': '{} Main Street'.format(index),
+            'phone': '555-{:04d}'.format(index % 10000),
+            'image_link': 'https://example.com/venues/{}.jpg'.format(index),
+            'facebook_link': 'https://www.facebook.com/venue{}'.format(index),
+            'website_link': 'https://example.com/venues/{}'.format(index),
+            'seeking_talent': rng.random() < 0.5,
+            'seeking_description': 'Looking for talent ' * rng.randint(1, 20),
+        })
+    bulk_insert(Artist.__table__, artists)
+    bulk_insert(Venue.__table__, venues)
+    bulk_insert(artist_genres_map, [{'artist_id': artist['id'], 'genres_id': genre_id}
+                                    for artist in artists for genre_id in rng.sample(genre_ids, 2)])
+    bulk_insert(venue_genres_map, [{'venue_id': venue['id'], 'genres_id': genre_id}
+                                   for venue in venues for genre_id in rng.sample(genre_ids, 3)])
+
+    # each artist is available one evening on each of 2 * SHOWS_PER_ARTIST days
+    # spread over the year around now, and plays on half of them at a random
+    # venue. A venue hosts at most one show per evening, so the data also
+    # satisfies the venue overlap constraint
+    availability = []
+    shows = []
+    venue_nights = set()
+    days = list(range(-365, 365))
+    for artist in artists:
+        for offset in sorted(rng.sample(days, 2 * SHOWS_PER_ARTIST)):
+            evening = now.replace(hour=18) + timedelta(days=offset)
+            availability.append({'artist_id': artist['id'], 'start_at': evening,
+                                 'end_at': evening + timedelta(hours=6)})
+            if len(shows) < num_shows and rng.random() < 0.5:
+                venue_id = rng.randint(1, num_venues)
+                for _ in range(num_venues):
+                    if (venue_id, offset) not in venue_nights:
+                        break
+                    venue_id = venue_id % num_venues + 1
+                else:
+                    continue
+                venue_nights.add((venue_id, offset))
+                start_time = evening + timedelta(hours=rng.randint(0, 3))
+                shows.append({'artist_id': artist['id'], 'venue_id': venue_id,
+                              'start_time': start_time, 'end_time': start_time + timedelta(hours=2)})
+    bulk_insert(Availability.__table__, availability)
+    bulk_insert(Show.__table__, shows)
+    rebuild_show_counters()
+    return {'artists': len(artists), 'venues': len(venues), 'availability': len(availability),
+            'shows': len(shows)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k', help='number of shows')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--create-all', action='store_true', help='create tables first (e.g. SQLite)')
+    args = parser.parse_args()
+    with app.app_context():
+        if args.create_all:
+            db.create_all()
+        if db.session.query(Show.id).first() is not None or db.session.query(Artist.id).first() is not None \
+                or db.session.query(Location.id).first() is not None:
+            sys.exit('Refusing to generate into a database that already has artists, locations or shows')
+        counts = generate(SCALES[args.scale], seed=args.seed)
+        if db.engine.dialect.name == 'postgresql':
+            # explicit ids were inserted; move the sequences past them
+            for table in ('Location', 'Artist', 'Venue'):
+                db.session.execute("SELECT setval(pg_get_serial_sequence('\"{0}\"', 'id'), "
+                                   "(SELECT max(id) FROM \"{0}\"))".format(table))
+            db.session.commit()
+    print(', '.join('{} {}'.format(value, key) for key, value in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+# ----------------------------------------------------------------------------#
+# Route benchmarks through the Flask test client.
+#
+#   DATABASE_URL=sqlite:///bench.db python -m benchmarks.routes --output bench.json
+#   DATABASE_URL=sqlite:///bench.db python -m benchmarks.routes --compare bench.json
+#
+# Every route in app.py (and the JSON API) is requested --iterations times
+# after --warmup untimed requests. The report has p50/p95/mean latency and the
+# SQL statements per request, as a table and optionally as JSON to diff
+# against another commit. Run benchmarks.datagen first to fill the database.
+# ----------------------------------------------------------------------------#
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from sqlalchemy import event, func
+from sqlalchemy.engine import Engine
+
+from app import app
+from app_config import db, page_cache, post_commit
+from locations import resolve_location
+from models import Venue, Artist, Show, Availability
+
+Route = namedtuple('Route', 'name method path data setup')
+
+
+def route(name, method, path, data=None, setup=None):
+    # path is formatted with the benchmark context (ids, times); data may be a
+    # dict or a callable taking that context; setup(context) runs untimed before
+    # each request and returns extra context
+    return Route(name, method, path, data, setup)
+
+
+def artist_form(context):
+    return {
+        'name': 'Bench Artist', 'city': 'Austin', 'state': 'TX', 'phone': '555-0100',
+        'image_link': 'https://example.com/bench.jpg', 'genres': ['Jazz', 'Blues'],
+        'facebook_link': 'https://www.facebook.com/bench', 'website_link': 'https://example.com',
+        'seeking_venue': 'y', 'seeking_description': 'Benchmarking',
+    }
+
+
+def venue_form(context):
+    data = artist_form(context)
+    data.update({'name': 'Bench Venue', 'address': '1 Bench Street', 'seeking_talent': 'y'})
+    return data
+
+
+def show_form(context):
+    return {
+        'artist_id': context['artist_id'], 'venue_id': context['venue_id'],
+        'start_time': context['window_start'], 'end_time': context['window_end'],
+    }
+
+
+def availability_form(context):
+    return {'start_at': context['window_start'], 'end_at': context['window_end']}
+
+
+def import_file(context):
+    line = json.dumps({'artist_id': context['artist_id'], 'venue_id': context['venue_id'],
+                       'start_time': context['window_start'], 'end_time': context['window_end']})
+    return {'file': (BytesIO(line.encode('utf-8')), 'shows.jsonl')}
+
+
+def disposable_venue(context):
+    # a fresh venue for delete_venue to remove
+    venue = Venue(name='Disposable Venue', location=resolve_location('Austin', 'TX'))
+    db.session.add(venue)
+    db.session.commit()
+    venue_id = venue.id
+    db.session.close()
+    return {'disposable_venue_id': venue_id}
+
+
+def disposable_artist(context):
+    # a fresh artist for delete_artist to remove
+    artist = Artist(name='Disposable Artist', location=resolve_location('Austin', 'TX'))
+    db.session.add(artist)
+    db.session.commit()
+    artist_id = artist.id
+    db.session.close()
+    return {'disposable_artist_id': artist_id}
+
+
+ROUTES = [
+    route('index', 'GET', '/'),
+    route('venues', 'GET', '/venues'),
+    route('search_venues', 'POST', '/venues/search', {'search_term': 'Music'}),
+    route('search_venues_city_state', 'POST', '/venues/search', {'search_term': 'Austin, TX'}),
+    route('search_venues_broad_page', 'GET', '/venues/search?search_term=a&page=3'),
+    route('show_venue', 'GET', '/venues/{venue_id}'),
+    route('create_venue_form', 'GET', '/venues/create'),
+    route('create_venue_submission', 'POST', '/venues/create', venue_form),
+    route('delete_venue', 'POST', '/venues/{disposable_venue_id}', setup=disposable_venue),
+    route('artists', 'GET', '/artists'),
+    route('delete_artist', 'POST', '/artists/{disposable_artist_id}', setup=disposable_artist),
+    route('search_artists', 'POST', '/artists/search', {'search_term': 'Band'}),
+    route('show_artist', 'GET', '/artists/{artist_id}'),
+    route('edit_artist', 'GET', '/artists/{artist_id}/edit'),
+    route('edit_artist_submission', 'POST', '/artists/{artist_id}/edit', artist_form),
+    route('edit_venue', 'GET', '/venues/{venue_id}/edit'),
+    route('edit_venue_submission', 'POST', '/venues/{venue_id}/edit', venue_form),
+    route('create_artist_form', 'GET', '/artists/create'),
+    route('create_artist_submission', 'POST', '/artists/create', artist_form),
+    route('search_suggest', 'GET', '/search/suggest?q=the'),
+    route('shows', 'GET', '/shows'),
+    route('shows_streamed', 'GET', '/shows?stream=1'),
+    route('create_shows', 'GET', '/shows/create'),
+    route('create_show_submission', 'POST', '/shows/create', show_form),
+    route('import_shows_submission', 'POST', '/shows/import', import_file),
+    route('create_availability', 'GET', '/artists/{artist_id}/availability/create'),
+    route('availability_submission', 'POST', '/artists/{artist_id}/availability/create', availability_form),
+    route('api.venues', 'GET', '/api/venues'),
+    route('api.search_venues', 'GET', '/api/venues/search?search_term=Music'),
+    route('api.show_venue', 'GET', '/api/venues/{venue_id}'),
+    route('api.search_artists', 'GET', '/api/artists/search?search_term=Band'),
+    route('api.search_artists_broad_page', 'GET', '/api/artists/search?search_term=a&page=3'),
+    route('api.show_artist', 'GET', '/api/artists/{artist_id}'),
+    route('api.shows', 'GET', '/api/shows'),
+    route('api.artist_free_slots', 'GET', '/api/artists/{artist_id}/free?start={day_start}&end={day_end}'),
+    route('api.free_artists', 'GET', '/api/availability/free?start={day_start}&end={day_end}'),
+]
+
+
+# ----------------------------------------------------------------------------#
+# Runner.
+# ----------------------------------------------------------------------------#
+
+class StatementCounter(object):
+    # statements run by the benchmark thread, leaving out post-commit tasks
+
+    def __init__(self):
+        self.count = 0
+        self.thread_id = threading.get_ident()
+        event.listen(Engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        if threading.get_ident() == self.thread_id:
+            self.count += 1
+
+
+def benchmark_context():
+    # the busiest venue and artist, and one of that artist's availability windows
+    venue_id = db.session.query(Show.venue_id).group_by(Show.venue_id) \
+        .order_by(func.count(Show.id).desc()).limit(1).scalar()
+    artist_id = db.session.query(Show.artist_id).group_by(Show.artist_id) \
+        .order_by(func.count(Show.id).desc()).limit(1).scalar()
+    if venue_id is None or artist_id is None:
+        sys.exit('No shows in the database - run python -m benchmarks.datagen first')
+    window = Availability.query.filter_by(artist_id=artist_id).order_by(Availability.start_at).first()
+    window_start = window.start_at if window else datetime.now() + timedelta(days=1000)
+    window_end = window.end_at if window else window_start + timedelta(hours=2)
+    context = {
+        'venue_id': venue_id,
+        'artist_id': artist_id,
+        'window_start': window_start.strftime('%Y-%m-%d %H:%M:%S'),
+        'window_end': window_end.strftime('%Y-%m-%d %H:%M:%S'),
+        'day_start': window_start.date().isoformat(),
+        'day_end': (window_start.date() + timedelta(days=1)).isoformat(),
+    }
+    db.session.close()
+    return context
+
+
+def percentile(sorted_values, fraction):
+    # nearest-rank percentile
+    index = max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_route(client, counter, bench_route, context, iterations, warmup):
+    timings = []
+    statements = []
+    status = None
+    for iteration in range(warmup + iterations):
+        request_context = dict(context)
+        if bench_route.setup is not None:
+            request_context.update(bench_route.setup(request_context))
+        path = bench_route.path.format(**request_context)
+        data = bench_route.data(request_context) if callable(bench_route.data) else bench_route.data
+        counter.count = 0
+        started = time.perf_counter()
+        response = client.open(path, method=bench_route.method, data=data)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        status = response.status_code
+        # untimed: let the request's post-commit tasks finish before the next one
+        post_commit.join()
+        if iteration >= warmup:
+            timings.append(elapsed * 1000)
+            statements.append(counter.count)
+    timings.sort()
+    return {
+        'status': status,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'statements': statistics.median(statements),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations=50, warmup=5, only=None):
+    with app.app_context():
+        context = benchmark_context()
+        counter = StatementCounter()
+        client = app.test_client()
+        results = {}
+        for bench_route in ROUTES:
+            if only and bench_route.name not in only:
+                continue
+            results[bench_route.name] = run_route(client, counter, bench_route, context, iterations, warmup)
+        meta = {
+            'commit': git_commit(),
+            'dialect': db.engine.dialect.name,
+            'shows': db.session.query(func.count(Show.id)).scalar(),
+            'artists': db.session.query(func.count(Artist.id)).scalar(),
+            'venues': db.session.query(func.count(Venue.id)).scalar(),
+            'page_cache': page_cache.enabled,
+            'iterations': iterations,
+            'created_at': datetime.utcnow().isoformat() + 'Z',
+        }
+        db.session.close()
+    return {'meta': meta, 'routes': results}
+
+
+# ----------------------------------------------------------------------------#
+# Report.
+# ----------------------------------------------------------------------------#
+
+def print_report(report, baseline=None):
+    baseline_routes = baseline['routes'] if baseline else {}
+    print('{:<28} {:>6} {:>10} {:>10} {:>10} {:>6}'.format('route', 'status', 'p50 ms', 'p95 ms', 'mean ms', 'sql'))
+    for name, result in report['routes'].items():
+        print('{:<28} {:>6} {:>10.2f} {:>10.2f} {:>10.2f} {:>6g}'.format(
+            name, result['status'], result['p50_ms'], result['p95_ms'], result['mean_ms'], result['statements']))
+        before = baseline_routes.get(name)
+        if before:
+            print('{:<28} {:>6} {:>+10.2f} {:>+10.2f} {:>+10.2f} {:>+6g}'.format(
+                '  vs ' + str(baseline['meta'].get('commit')), '',
+                result['p50_ms'] - before['p50_ms'], result['p95_ms'] - before['p95_ms'],
+                result['mean_ms'] - before['mean_ms'], result['statements'] - before['statements']))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--route', action='append', help='only run these routes (repeatable)')
+    parser.add_argument('--page-cache', action='store_true', help='leave the detail page cache on')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report from another run to diff against')
+    args = parser.parse_args()
+
+    page_cache.enabled = args.page_cache
+    report = run(iterations=args.iterations, warmup=args.warmup, only=args.route)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as compare_file:
+            baseline = json.load(compare_file)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
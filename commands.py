@@ -0,0 +1,131 @@
+import sys
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app_config import db, page_cache
+from counters import roll_over_show_counters, rebuild_show_counters, verify_show_counters
+from genre_cache import genre_ids
+from invalidation import invalidate_show_pages
+from models import Genres
+from show_import import SHOW_IMPORT_FORMATS, import_format, read_show_records, import_shows
+from show_partitions import create_show_partitions, archive_shows
+from suggest import rebuild_suggest_index
+
+
+# ----------------------------------------------------------------------------#
+# Launch.
+# ----------------------------------------------------------------------------#
+
+def initial_genres():
+    genres_list = ['Alternative', 'Blues', 'Classical', 'Country',
+                   'Electronic', 'Folk', 'Funk', 'Hip-Hop',
+                   'Heavy Metal', 'Instrumental', 'Jazz', 'Musical Theatre',
+                   'Pop', 'Punk', 'R&B', 'Reggae', 'Rock n Roll', 'Soul', 'Other']
+    existing_genres = genre_ids()
+    for genres in genres_list:
+        if genres not in existing_genres:
+            g = Genres(name=genres)
+            db.session.add(g)
+        else:
+            print(genres)
+    db.session.commit()
+    db.session.close()
+
+
+# ----------------------------------------------------------------------------#
+# CLI commands.
+# ----------------------------------------------------------------------------#
+
+@click.command('rollover-show-counters')
+@with_appcontext
+def rollover_show_counters_command():
+    # run periodically (e.g. from cron) to move started shows from upcoming to past
+    moved = roll_over_show_counters()
+    print('Rolled over show counters for {} rows'.format(moved))
+
+
+@click.command('rebuild-show-counters')
+@with_appcontext
+def rebuild_show_counters_command():
+    rebuild_show_counters()
+    mismatches = verify_show_counters()
+    for table, entity_id, stored, actual in mismatches:
+        print('{} {}: stored {} actual {}'.format(table, entity_id, stored, actual))
+    if mismatches:
+        sys.exit(1)
+    print('Show counters rebuilt and verified')
+
+
+@click.command('import-shows')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(SHOW_IMPORT_FORMATS), help='Defaults to the file extension.')
+@with_appcontext
+def import_shows_command(path, fmt):
+    fmt = import_format(path, fmt)
+    if fmt is None:
+        raise click.BadParameter('use a .csv or .jsonl file or pass --format', param_hint='path')
+    with open(path, newline='', encoding='utf-8') as lines:
+        inserted, rejected = import_shows(read_show_records(lines, fmt),
+                                          chunk_size=current_app.config['SHOW_IMPORT_CHUNK_SIZE'],
+                                          on_commit=invalidate_show_pages)
+    for line, reason in rejected:
+        print('line {}: {}'.format(line, reason))
+    print('Imported {} shows, rejected {}'.format(inserted, len(rejected)))
+
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    # restart the app afterwards so it picks up the new manifest
+    from assets import build_assets, missing_build_modules
+    manifest = build_assets(current_app.static_folder)
+    for logical_name, hashed_name in sorted(manifest.items()):
+        if isinstance(hashed_name, str):
+            print('{} -> {}'.format(logical_name, hashed_name))
+    for package, skipped in missing_build_modules():
+        click.echo('Warning: {} is not installed: {} (pip install {})'.format(package, skipped, package), err=True)
+
+
+@click.command('rebuild-suggest-index')
+@with_appcontext
+def rebuild_suggest_index_command():
+    # run when suggestions drifted from the database (e.g. after a bulk load).
+    # Workers hear about it through a stamp in the page cache backend, so it
+    # takes the shared Redis backend: the in-process one goes away with this
+    # command, and workers would only catch up after SUGGEST_INDEX_MAX_AGE
+    if current_app.config.get('RESPONSE_CACHE_BACKEND') != 'redis':
+        raise click.ClickException(
+            "rebuild-suggest-index needs RESPONSE_CACHE_BACKEND = 'redis' to reach running workers. "
+            "With the in-process backend each worker rebuilds within SUGGEST_INDEX_MAX_AGE "
+            "({} seconds) or on restart.".format(current_app.config['SUGGEST_INDEX_MAX_AGE']))
+    page_cache.bump('suggest', 'index')
+    entries = rebuild_suggest_index()
+    print('Search suggestion index rebuilt with {} entries'.format(entries))
+
+
+@click.command('create-show-partitions')
+@with_appcontext
+def create_show_partitions_command():
+    # run monthly; a no-op off Postgres, where show isn't partitioned
+    created = create_show_partitions(current_app.config['SHOW_PARTITION_MONTHS_AHEAD'])
+    for name in created:
+        print('Created {}'.format(name))
+    print('Created {} show partitions'.format(len(created)))
+
+
+@click.command('archive-shows')
+@click.option('--months', type=click.IntRange(min=1), help='Defaults to SHOW_ARCHIVE_AFTER_MONTHS.')
+@with_appcontext
+def archive_shows_command(months):
+    # moves old shows to show_archive; pages keep listing them via show_history
+    cutoff, moved = archive_shows(months or current_app.config['SHOW_ARCHIVE_AFTER_MONTHS'])
+    print('Archived {} shows starting before {:%Y-%m-%d}'.format(moved, cutoff))
+
+
+def register_commands(app):
+    for command in (rollover_show_counters_command, rebuild_show_counters_command,
+                    import_shows_command, build_assets_command, rebuild_suggest_index_command,
+                    create_show_partitions_command, archive_shows_command):
+        app.cli.add_command(command)
@@ -10,4 +10,63 @@ DEBUG = True
 
 
 # TODO IMPLEMENT DATABASE URL
-SQLALCHEMY_DATABASE_URI = 'postgresql://ajitmourya@localhost:5432/fyyur'
+# set DATABASE_URL (e.g. sqlite:///fyyur.db) to run against another backend locally
+SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'postgresql://ajitmourya@localhost:5432/fyyur')
+
+# Shows listing: rows per page (keyset paginated) and whether to stream the render
+SHOWS_PAGE_SIZE = 50
+SHOWS_MAX_PAGE_SIZE = 200
+SHOWS_STREAM = False
+
+# Bulk show import: rows inserted per transaction
+SHOW_IMPORT_CHUNK_SIZE = 1000
+
+# Request instrumentation (Server-Timing headers and /metrics), off by default.
+# Requests over SQL_STATEMENT_BUDGET statements are logged, or fail with
+# SQL_STATEMENT_BUDGET_ACTION = 'fail'
+INSTRUMENTATION_ENABLED = os.environ.get('FYYUR_INSTRUMENTATION') == '1'
+SQL_STATEMENT_BUDGET = None
+SQL_STATEMENT_BUDGET_ACTION = 'log'
+
+# Artist/venue detail page cache. The default backend is an in-process LRU;
+# set RESPONSE_CACHE_BACKEND = 'redis' to share entries (and invalidation)
+# between worker processes
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+RESPONSE_CACHE_BACKEND = 'lru'
+RESPONSE_CACHE_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+# Free-slot finder: widest start..end window one request may ask for
+FREE_SLOTS_MAX_WINDOW_DAYS = 31
+
+# /search/suggest: in-process prefix index, rebuilt after SUGGEST_INDEX_MAX_AGE
+# seconds; a `flask rebuild-suggest-index` (Redis page cache backend only) is
+# picked up within SUGGEST_INDEX_CHECK_INTERVAL seconds
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+SUGGEST_INDEX_MAX_AGE = 300
+SUGGEST_INDEX_CHECK_INTERVAL = 5
+
+# Post-commit tasks (tasks.py): a pool of TASKS_WORKERS threads behind a
+# queue of TASKS_QUEUE_SIZE; a commit finding it full for TASKS_SUBMIT_TIMEOUT
+# seconds runs its task before returning. TASKS_MODE = 'sync' runs every task
+# before commit() returns, e.g. in tests
+TASKS_MODE = 'thread'
+TASKS_WORKERS = 4
+TASKS_QUEUE_SIZE = 1000
+TASKS_SUBMIT_TIMEOUT = 1.0
+TASKS_MAX_RETRIES = 3
+TASKS_RETRY_BACKOFF = 0.5
+
+# Venue/artist search: results per page, and the number of matches up to
+# which the total is counted exactly (estimated past it)
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_EXACT_COUNT_LIMIT = 1000
+
+# Show partitions and archival (show_partitions.py): `flask create-show-partitions`
+# keeps this many months of Postgres partitions ahead, `flask archive-shows`
+# moves shows older than SHOW_ARCHIVE_AFTER_MONTHS to show_archive
+SHOW_PARTITION_MONTHS_AHEAD = 12
+SHOW_ARCHIVE_AFTER_MONTHS = 24
@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+from datetime import datetime
+
+from collections import Counter
+
+from sqlalchemy import and_, bindparam, case, func, select
+
+from app_config import db
+from models import Venue, Artist, Show, ShowHistory, ShowCounterState
+
+# every counted entity with the Show and ShowHistory columns that point at it
+COUNTED = ((Venue, Show.venue_id, ShowHistory.venue_id), (Artist, Show.artist_id, ShowHistory.artist_id))
+
+
+# ----------------------------------------------------------------------------#
+# Show counters.
+#
+# Venue/Artist.upcoming_shows_count and past_shows_count are exact as of
+# ShowCounterState.rolled_over_at: a show starting before it is past, anything
+# else is upcoming. New shows bump the counters in their own transaction and
+# roll_over_show_counters() moves shows that started since the last rollover.
+# Archived shows (show_partitions.py) all started before the watermark, so
+# past counts are taken over show_history and everything else over show.
+# ----------------------------------------------------------------------------#
+
+def counter_state(lock=False, read=False):
+    query = ShowCounterState.query
+    if lock:
+        query = query.with_for_update(read=read)
+    state = query.filter_by(id=1).first()
+    if state is None:
+        state = ShowCounterState(id=1, rolled_over_at=datetime.now())
+        db.session.add(state)
+        db.session.flush()
+    return state
+
+
+def count_new_show(show):
+    # call before committing the session that inserts show; the shared lock keeps
+    # a concurrent rollover from moving the watermark underneath us
+    watermark = counter_state(lock=True, read=True).rolled_over_at
+    is_past = show.start_time < watermark
+    for model, key in ((Venue, show.venue_id), (Artist, show.artist_id)):
+        column = model.past_shows_count if is_past else model.upcoming_shows_count
+        db.session.query(model).filter(model.id == key) \
+            .update({column: column + 1}, synchronize_session=False)
+
+
+def count_new_shows(rows):
+    # bulk form of count_new_show for plain dict rows: one executemany per table
+    watermark = counter_state(lock=True, read=True).rolled_over_at
+    for model, key_column, _ in COUNTED:
+        upcoming = Counter()
+        past = Counter()
+        for row in rows:
+            target = past if row['start_time'] < watermark else upcoming
+            target[row[key_column.key]] += 1
+        params = [{'entity_id': entity_id, 'upcoming': upcoming[entity_id], 'past': past[entity_id]}
+                  for entity_id in set(upcoming) | set(past)]
+        if not params:
+            continue
+        table = model.__table__
+        db.session.execute(table.update()
+                           .where(table.c.id == bindparam('entity_id'))
+                           .values(upcoming_shows_count=table.c.upcoming_shows_count + bindparam('upcoming'),
+                                   past_shows_count=table.c.past_shows_count + bindparam('past')),
+                           params)
+
+
+def roll_over_show_counters(now=None):
+    # moves shows that started in [rolled_over_at, now) from upcoming to past
+    now = now or datetime.now()
+    state = counter_state(lock=True)
+    if now <= state.rolled_over_at:
+        db.session.rollback()
+        return 0
+    moved = 0
+    for model, key_column, _ in COUNTED:
+        rolled = db.session.query(key_column.label('entity_id'), func.count(Show.id).label('num_shows')) \
+            .filter(Show.start_time >= state.rolled_over_at, Show.start_time < now) \
+            .group_by(key_column) \
+            .subquery()
+        num_shows = select([rolled.c.num_shows]).where(rolled.c.entity_id == model.id).as_scalar()
+        moved += db.session.query(model).filter(model.id.in_(select([rolled.c.entity_id]))) \
+            .update({model.upcoming_shows_count: model.upcoming_shows_count - num_shows,
+                     model.past_shows_count: model.past_shows_count + num_shows},
+                    synchronize_session=False)
+    state.rolled_over_at = now
+    db.session.commit()
+    return moved
+
+
+def rebuild_show_counters(now=None):
+    # recomputes every counter from the show table and resets the watermark
+    now = now or datetime.now()
+    state = counter_state(lock=True)
+    for model, key_column, history_key in COUNTED:
+        upcoming = select([func.count(Show.id)]) \
+            .where(and_(key_column == model.id, Show.start_time >= now)).as_scalar()
+        past = select([func.count(ShowHistory.id)]) \
+            .where(and_(history_key == model.id, ShowHistory.start_time < now)).as_scalar()
+        db.session.query(model).update({model.upcoming_shows_count: upcoming,
+                                        model.past_shows_count: past},
+                                       synchronize_session=False)
+    state.rolled_over_at = now
+    db.session.commit()
+
+
+def verify_show_counters():
+    # [(table, id, stored (upcoming, past), actual (upcoming, past))] for every
+    # entity whose counters disagree with the show table at the watermark
+    watermark = counter_state().rolled_over_at
+    mismatches = []
+    for model, _, history_key in COUNTED:
+        upcoming = func.count(case([(ShowHistory.start_time >= watermark, ShowHistory.id)]))
+        past = func.count(case([(ShowHistory.start_time < watermark, ShowHistory.id)]))
+        rows = db.session.query(model.id, model.upcoming_shows_count, model.past_shows_count,
+                                upcoming.label('upcoming'), past.label('past')) \
+            .outerjoin(ShowHistory, history_key == model.id) \
+            .group_by(model.id, model.upcoming_shows_count, model.past_shows_count) \
+            .all()
+        for row in rows:
+            if (row.upcoming_shows_count, row.past_shows_count) != (row.upcoming, row.past):
+                mismatches.append((model.__tablename__, row.id,
+                                   (row.upcoming_shows_count, row.past_shows_count),
+                                   (row.upcoming, row.past)))
+    db.session.rollback()
+    return mismatches
@@ -0,0 +1,76 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+from sqlalchemy import bindparam, case, func
+
+from app_config import db
+from counters import counter_state
+from models import Venue, Artist, Show, ShowHistory, Availability, show_archive, venue_genres_map, \
+    artist_genres_map
+
+# for each deletable model: the ShowHistory column pointing at it, the model on
+# the other side of its shows with that side's ShowHistory column, and the
+# columns of the tables whose rows belong to it
+DEPENDENTS = {
+    Venue: (ShowHistory.venue_id, Artist, ShowHistory.artist_id,
+            (Show.__table__.c.venue_id, show_archive.c.venue_id, venue_genres_map.c.venue_id)),
+    Artist: (ShowHistory.artist_id, Venue, ShowHistory.venue_id,
+             (Show.__table__.c.artist_id, show_archive.c.artist_id, artist_genres_map.c.artist_id,
+              Availability.__table__.c.artist_id)),
+}
+
+
+# ----------------------------------------------------------------------------#
+# Set-based deletes.
+#
+# A venue or artist goes away with its live and archived shows, genre rows
+# and availability in one transaction of bulk DELETE ... WHERE statements, so
+# no dependent row is loaded into the session. The ON DELETE CASCADE foreign
+# keys would remove them too, but the explicit deletes also cover SQLite
+# without foreign keys enabled. Shows on the other side are uncounted first so
+# its show counters stay exact.
+# ----------------------------------------------------------------------------#
+
+def delete_with_dependents(model, entity_id):
+    # commits and returns the ids on the other side whose show lists changed,
+    # or rolls back and returns None if there is no such row
+    key_column, other_model, other_key, owned_columns = DEPENDENTS[model]
+    # same lock order as count_new_show: counter state, then the entity rows
+    watermark = counter_state(lock=True, read=True).rolled_over_at
+    # the row lock makes concurrent show inserts for this entity wait on their
+    # foreign key check, so no show slips in between counting and deleting
+    found = db.session.query(model.id).filter(model.id == entity_id).with_for_update().scalar()
+    if found is None:
+        db.session.rollback()
+        return None
+
+    removed = db.session.query(other_key.label('entity_id'),
+                               func.count(case([(ShowHistory.start_time >= watermark, ShowHistory.id)]))
+                               .label('upcoming'),
+                               func.count(case([(ShowHistory.start_time < watermark, ShowHistory.id)]))
+                               .label('past')) \
+        .filter(key_column == entity_id) \
+        .group_by(other_key) \
+        .all()
+    if removed:
+        table = other_model.__table__
+        db.session.execute(table.update()
+                           .where(table.c.id == bindparam('entity_id'))
+                           .values(upcoming_shows_count=table.c.upcoming_shows_count - bindparam('upcoming'),
+                                   past_shows_count=table.c.past_shows_count - bindparam('past')),
+                           [row._asdict() for row in removed])
+
+    for column in owned_columns:
+        db.session.execute(column.table.delete().where(column == entity_id))
+    table = model.__table__
+    db.session.execute(table.delete().where(table.c.id == entity_id))
+    db.session.commit()
+    return [row.entity_id for row in removed]
+
+
+def delete_venue_cascade(venue_id):
+    return delete_with_dependents(Venue, venue_id)
+
+
+def delete_artist_cascade(artist_id):
+    return delete_with_dependents(Artist, artist_id)
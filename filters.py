@@ -0,0 +1,29 @@
+import functools
+
+# ----------------------------------------------------------------------------#
+# Filters.
+#
+# babel and dateutil are imported on first use rather than at startup.
+# ----------------------------------------------------------------------------#
+
+DATETIME_FORMATS = {
+    'full': "EEEE MMMM, d, y 'at' h:mma",
+    'medium': "EE MM, dd, y h:mma",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def compiled_datetime_pattern(format, locale):
+    # babel pattern and locale, parsed once per (format, locale)
+    import babel
+    import babel.dates
+    return babel.dates.parse_pattern(DATETIME_FORMATS.get(format, format)), babel.Locale.parse(locale)
+
+
+def format_datetime(value, format='medium', locale='en'):
+    # views pass datetime objects; strings are still accepted and parsed
+    if isinstance(value, str):
+        import dateutil.parser
+        value = dateutil.parser.parse(value)
+    pattern, locale = compiled_datetime_pattern(format, locale)
+    return pattern.apply(value, locale)
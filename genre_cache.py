@@ -0,0 +1,54 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from app_config import db
+from models import Genres
+
+# ----------------------------------------------------------------------------#
+# Genre cache.
+#
+# Process-local name -> id map, loaded with one query on first use. Genres are
+# effectively static, so the map is only dropped when a Genres row is inserted.
+# ----------------------------------------------------------------------------#
+
+_lock = threading.Lock()
+_genre_ids = None
+
+
+def invalidate_genre_cache(*args):
+    global _genre_ids
+    with _lock:
+        _genre_ids = None
+
+
+event.listen(Genres, 'after_insert', invalidate_genre_cache)
+
+
+def genre_ids(refresh=False):
+    global _genre_ids
+    cached = _genre_ids
+    if cached is None or refresh:
+        cached = dict(db.session.query(Genres.name, Genres.id))
+        with _lock:
+            _genre_ids = cached
+    return cached
+
+
+def resolve_genres(names):
+    # Genres instances for the given names, attached to the current session
+    # without a SELECT on a warm cache; unknown names are dropped after one reload
+    ids = genre_ids()
+    if any(name not in ids for name in names):
+        ids = genre_ids(refresh=True)
+    genres = []
+    for name in names:
+        if name in ids:
+            genre = Genres(id=ids[name], name=name)
+            make_transient_to_detached(genre)
+            genres.append(db.session.merge(genre, load=False))
+    return genres
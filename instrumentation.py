@@ -0,0 +1,165 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request, Response, before_render_template, template_rendered
+from flask.signals import signals_available
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class StatementBudgetExceeded(Exception):
+    # raised in 'fail' mode; handlers with a catch-all except re-raise it first
+    pass
+
+
+# ----------------------------------------------------------------------------#
+# Metrics registry.
+# ----------------------------------------------------------------------------#
+
+class MetricsRegistry(object):
+    # minimal thread-safe counters/gauges rendered in Prometheus text format
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._meta = {}
+
+    def describe(self, name, kind, help_text):
+        self._meta[name] = (kind, help_text)
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] += value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = []
+        described = set()
+        for (name, labels), value in values:
+            if name not in described and name in self._meta:
+                kind, help_text = self._meta[name]
+                lines.append('# HELP {} {}'.format(name, help_text))
+                lines.append('# TYPE {} {}'.format(name, kind))
+                described.add(name)
+            label_text = ','.join('{}="{}"'.format(key, str(val).replace('\\', '\\\\').replace('"', '\\"'))
+                                  for key, val in labels)
+            lines.append('{}{} {}'.format(name, '{' + label_text + '}' if label_text else '', repr(float(value))))
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+metrics.describe('fyyur_requests_total', 'counter', 'Requests handled per endpoint.')
+metrics.describe('fyyur_request_seconds_total', 'counter', 'Total request latency per endpoint.')
+metrics.describe('fyyur_sql_statements_total', 'counter', 'SQL statements executed per endpoint.')
+metrics.describe('fyyur_sql_seconds_total', 'counter', 'Time spent in SQL per endpoint.')
+metrics.describe('fyyur_template_seconds_total', 'counter', 'Time spent rendering templates per endpoint.')
+metrics.describe('fyyur_statement_budget_exceeded_total', 'counter',
+                 'Requests that went over SQL_STATEMENT_BUDGET per endpoint.')
+
+
+# ----------------------------------------------------------------------------#
+# Request instrumentation.
+#
+# Opt-in (INSTRUMENTATION_ENABLED): counts SQL statements and times SQL,
+# template rendering and the whole request, per endpoint. Results go out as a
+# Server-Timing header and accumulate in /metrics.
+# ----------------------------------------------------------------------------#
+
+def _request_stats():
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats()
+    if stats is None:
+        return
+    stats['statements'] += 1
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+    budget = stats['budget']
+    if budget is not None and stats['statements'] > budget and stats['fail_over_budget']:
+        conn.info['query_start_time'].pop()
+        raise StatementBudgetExceeded('{} exceeded its budget of {} SQL statements'
+                                      .format(request.endpoint, budget))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats()
+    if stats is None or not conn.info.get('query_start_time'):
+        return
+    stats['sql_seconds'] += time.perf_counter() - conn.info['query_start_time'].pop()
+
+
+def _before_render_template(sender, template, context, **extra):
+    stats = _request_stats()
+    if stats is not None:
+        stats['template_started'].append(time.perf_counter())
+
+
+def _template_rendered(sender, template, context, **extra):
+    stats = _request_stats()
+    if stats is not None and stats['template_started']:
+        stats['template_seconds'] += time.perf_counter() - stats['template_started'].pop()
+
+
+def init_instrumentation(app):
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    # template timing needs Flask's signals, which need blinker; without it
+    # requests are still counted and timed, just not their templates
+    if signals_available:
+        before_render_template.connect(_before_render_template, app)
+        template_rendered.connect(_template_rendered, app)
+    else:
+        app.logger.warning('blinker is not installed, template rendering time is not measured')
+
+    @app.before_request
+    def start_request_stats():
+        g.request_stats = {
+            'started': time.perf_counter(),
+            'statements': 0,
+            'sql_seconds': 0.0,
+            'template_started': [],
+            'template_seconds': 0.0,
+            'budget': app.config.get('SQL_STATEMENT_BUDGET'),
+            'fail_over_budget': app.config.get('SQL_STATEMENT_BUDGET_ACTION') == 'fail',
+        }
+
+    @app.after_request
+    def record_request_stats(response):
+        stats = g.pop('request_stats', None)
+        if stats is None or request.endpoint == 'metrics':
+            return response
+        # streamed bodies are rendered after this point and are not included
+        total_seconds = time.perf_counter() - stats['started']
+        endpoint = request.endpoint or 'unknown'
+        metrics.inc('fyyur_requests_total', endpoint=endpoint)
+        metrics.inc('fyyur_request_seconds_total', total_seconds, endpoint=endpoint)
+        metrics.inc('fyyur_sql_statements_total', stats['statements'], endpoint=endpoint)
+        metrics.inc('fyyur_sql_seconds_total', stats['sql_seconds'], endpoint=endpoint)
+        if signals_available:
+            metrics.inc('fyyur_template_seconds_total', stats['template_seconds'], endpoint=endpoint)
+        budget = stats['budget']
+        if budget is not None and stats['statements'] > budget:
+            metrics.inc('fyyur_statement_budget_exceeded_total', endpoint=endpoint)
+            app.logger.warning('%s ran %d SQL statements (budget %d)', endpoint, stats['statements'], budget)
+        response.headers.add('Server-Timing', 'db;dur={:.2f};desc="{} statements"'.format(
+            stats['sql_seconds'] * 1000, stats['statements']))
+        if signals_available:
+            response.headers.add('Server-Timing', 'tpl;dur={:.2f}'.format(stats['template_seconds'] * 1000))
+        response.headers.add('Server-Timing', 'total;dur={:.2f}'.format(total_seconds * 1000))
+        return response
+
+    @app.route('/metrics', endpoint='metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,35 @@
+from app_config import db, page_cache
+from models import ShowHistory
+
+
+# ----------------------------------------------------------------------------#
+# Page cache invalidation.
+#
+# Write handlers bump the edited entity's own page right after the commit so
+# the page they redirect to is fresh, and leave the rest (home panel, pages
+# of the other side of its shows) to these functions as post-commit tasks.
+# ----------------------------------------------------------------------------#
+
+def invalidate_artist_listings(artist_id, venue_ids=None):
+    # the home panel and every venue page listing one of the artist's shows;
+    # pass venue_ids when the shows are already gone
+    page_cache.invalidate_fragment('recent_artists')
+    if venue_ids is None:
+        venue_ids = [venue_id for venue_id, in
+                     db.session.query(ShowHistory.venue_id).filter(ShowHistory.artist_id == artist_id).distinct()]
+    page_cache.bump_many('venue', venue_ids)
+
+
+def invalidate_venue_listings(venue_id, artist_ids=None):
+    # the home panel and every artist page listing one of the venue's shows;
+    # pass artist_ids when the shows are already gone
+    page_cache.invalidate_fragment('recent_venues')
+    if artist_ids is None:
+        artist_ids = [artist_id for artist_id, in
+                      db.session.query(ShowHistory.artist_id).filter(ShowHistory.venue_id == venue_id).distinct()]
+    page_cache.bump_many('artist', artist_ids)
+
+
+def invalidate_show_pages(rows):
+    page_cache.bump_many('artist', [row['artist_id'] for row in rows])
+    page_cache.bump_many('venue', [row['venue_id'] for row in rows])
@@ -0,0 +1,32 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+from sqlalchemy.exc import IntegrityError
+
+from app_config import db
+from models import Location
+from queries import location_equals
+
+
+# ----------------------------------------------------------------------------#
+# Locations.
+# ----------------------------------------------------------------------------#
+
+def resolve_location(city, state):
+    # the Location for a form's city/state, matched case-insensitively and
+    # created on first use; None without a city
+    city = (city or '').strip()
+    state = (state or '').strip()
+    if not city:
+        return None
+    location = Location.query.filter(location_equals(city, state)).first()
+    if location is not None:
+        return location
+    try:
+        with db.session.begin_nested():
+            location = Location(city=city, state=state)
+            db.session.add(location)
+    except IntegrityError:
+        # another request created it first
+        location = Location.query.filter(location_equals(city, state)).one()
+    return location
@@ -0,0 +1,37 @@
+"""trigram search indexes on Artist and Venue
+
+Revision ID: 3f1c9a7d2e40
+Revises: ef8841582aa1
+Create Date: 2026-10-18 10:12:03.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2e40'
+down_revision = 'ef8841582aa1'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('name', 'city', 'state')
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    if postgres:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in ('Artist', 'Venue'):
+        for column in SEARCH_COLUMNS:
+            if postgres:
+                op.create_index('ix_{}_{}_trgm'.format(table.lower(), column), table, [column],
+                                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+            else:
+                op.create_index('ix_{}_{}_trgm'.format(table.lower(), column), table, [column])
+
+
+def downgrade():
+    for table in ('Artist', 'Venue'):
+        for column in SEARCH_COLUMNS:
+            op.drop_index('ix_{}_{}_trgm'.format(table.lower(), column), table_name=table)
@@ -0,0 +1,50 @@
+"""denormalized show counters on Artist and Venue
+
+Revision ID: 8a4d6b0c51f2
+Revises: 3f1c9a7d2e40
+Create Date: 2026-10-18 11:02:47.520913
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4d6b0c51f2'
+down_revision = '3f1c9a7d2e40'
+branch_labels = None
+depends_on = None
+
+COUNTED = (('Artist', 'artist_id'), ('Venue', 'venue_id'))
+
+
+def upgrade():
+    for table, _ in COUNTED:
+        op.add_column(table, sa.Column('upcoming_shows_count', sa.Integer(), nullable=False, server_default='0'))
+        op.add_column(table, sa.Column('past_shows_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_table('show_counter_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rolled_over_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # backfill from the show table, as of now
+    now = datetime.now()
+    connection = op.get_bind()
+    for table, key in COUNTED:
+        connection.execute(sa.text(
+            'UPDATE "{table}" SET '
+            'upcoming_shows_count = (SELECT count(*) FROM show WHERE show.{key} = "{table}".id '
+            'AND show.start_time >= :now), '
+            'past_shows_count = (SELECT count(*) FROM show WHERE show.{key} = "{table}".id '
+            'AND show.start_time < :now)'.format(table=table, key=key)), now=now)
+    connection.execute(sa.text('INSERT INTO show_counter_state (id, rolled_over_at) VALUES (1, :now)'), now=now)
+
+
+def downgrade():
+    op.drop_table('show_counter_state')
+    for table, _ in COUNTED:
+        op.drop_column(table, 'past_shows_count')
+        op.drop_column(table, 'upcoming_shows_count')
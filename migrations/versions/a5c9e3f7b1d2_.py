@@ -0,0 +1,47 @@
+"""ON DELETE CASCADE for rows owned by an artist or venue
+
+Revision ID: a5c9e3f7b1d2
+Revises: f3a8c1d9e2b7
+Create Date: 2026-10-18 15:20:37.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5c9e3f7b1d2'
+down_revision = 'f3a8c1d9e2b7'
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table) for every foreign key that now cascades
+OWNED_KEYS = (
+    ('show', 'artist_id', 'Artist'),
+    ('show', 'venue_id', 'Venue'),
+    ('availability', 'artist_id', 'Artist'),
+    ('artist_genres_map', 'artist_id', 'Artist'),
+    ('venue_genres_map', 'venue_id', 'Venue'),
+)
+
+# the initial migration left these foreign keys unnamed: Postgres named them
+# <table>_<column>_fkey, and on SQLite the convention names them for batch mode
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s'}
+
+
+def replace_foreign_keys(ondelete, old_name):
+    for table, column, referenced in OWNED_KEYS:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(old_name(table, column), type_='foreignkey')
+            batch_op.create_foreign_key('fk_{}_{}'.format(table, column), referenced,
+                                        [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        replace_foreign_keys('CASCADE', '{}_{}_fkey'.format)
+    else:
+        replace_foreign_keys('CASCADE', 'fk_{}_{}'.format)
+
+
+def downgrade():
+    replace_foreign_keys(None, 'fk_{}_{}'.format)
@@ -0,0 +1,136 @@
+"""monthly show partitions on Postgres, show_archive and the show_history view
+
+Revision ID: b7e2d4f6a9c1
+Revises: a5c9e3f7b1d2
+Create Date: 2026-10-18 16:42:09.503871
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4f6a9c1'
+down_revision = 'a5c9e3f7b1d2'
+branch_labels = None
+depends_on = None
+
+SHOW_COLUMNS = 'id, artist_id, venue_id, start_time, end_time'
+
+# partitions created past the current month; `flask create-show-partitions` adds more
+MONTHS_AHEAD = 12
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def add_no_overlap_constraints(table, names):
+    # names: {column: constraint name} for artist_id and venue_id
+    for column in ('artist_id', 'venue_id'):
+        op.execute("ALTER TABLE {0} ADD CONSTRAINT {1} EXCLUDE USING gist "
+                   "({2} WITH =, tsrange(start_time, end_time, '[]') WITH &&)".format(table, names[column], column))
+
+
+def add_show_keys(table):
+    op.execute('ALTER TABLE {0} ADD CONSTRAINT fk_show_artist_id FOREIGN KEY (artist_id) '
+               'REFERENCES "Artist" (id) ON DELETE CASCADE'.format(table))
+    op.execute('ALTER TABLE {0} ADD CONSTRAINT fk_show_venue_id FOREIGN KEY (venue_id) '
+               'REFERENCES "Venue" (id) ON DELETE CASCADE'.format(table))
+    op.create_index('ix_show_artist_time', table, ['artist_id', 'start_time', 'end_time'])
+    op.create_index('ix_show_venue_time', table, ['venue_id', 'start_time', 'end_time'])
+
+
+def partition_show():
+    # rebuilds show as a table partitioned by month of start_time, with one
+    # partition per month from the oldest show to MONTHS_AHEAD from now and a
+    # default partition. The primary key has to include start_time, and the
+    # exclusion constraints move onto each partition
+    op.execute('ALTER TABLE show RENAME TO show_unpartitioned')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY NONE')
+    op.execute("CREATE TABLE show ("
+               "id integer NOT NULL DEFAULT nextval('show_id_seq'), "
+               "artist_id integer NOT NULL, "
+               "venue_id integer NOT NULL, "
+               "start_time timestamp without time zone NOT NULL, "
+               "end_time timestamp without time zone NOT NULL"
+               ") PARTITION BY RANGE (start_time)")
+    now = datetime.now()
+    month = datetime(now.year, now.month, 1)
+    oldest = op.get_bind().execute(sa.text('SELECT min(start_time) FROM show_unpartitioned')).scalar()
+    if oldest is not None:
+        month = min(month, datetime(oldest.year, oldest.month, 1))
+    partitions = ['show_default']
+    while month < add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD + 1):
+        name = 'show_p{:%Y%m}'.format(month)
+        op.execute("CREATE TABLE {} PARTITION OF show FOR VALUES FROM ('{:%Y-%m-%d}') TO ('{:%Y-%m-%d}')"
+                   .format(name, month, add_months(month, 1)))
+        partitions.append(name)
+        month = add_months(month, 1)
+    op.execute('CREATE TABLE show_default PARTITION OF show DEFAULT')
+
+    op.execute('INSERT INTO show ({0}) SELECT {0} FROM show_unpartitioned'.format(SHOW_COLUMNS))
+    op.execute('DROP TABLE show_unpartitioned')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY show.id')
+    op.execute('ALTER TABLE show ADD CONSTRAINT show_pkey PRIMARY KEY (id, start_time)')
+    add_show_keys('show')
+    for name in partitions:
+        add_no_overlap_constraints(name, {column: '{}_{}_no_overlap'.format(name, column)
+                                          for column in ('artist_id', 'venue_id')})
+
+
+def unpartition_show():
+    op.execute('ALTER TABLE show RENAME TO show_partitioned')
+    op.execute('ALTER TABLE show_partitioned RENAME CONSTRAINT show_pkey TO show_partitioned_pkey')
+    op.execute('ALTER INDEX ix_show_artist_time RENAME TO ix_show_partitioned_artist_time')
+    op.execute('ALTER INDEX ix_show_venue_time RENAME TO ix_show_partitioned_venue_time')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY NONE')
+    op.execute("CREATE TABLE show ("
+               "id integer NOT NULL DEFAULT nextval('show_id_seq'), "
+               "artist_id integer NOT NULL, "
+               "venue_id integer NOT NULL, "
+               "start_time timestamp without time zone NOT NULL, "
+               "end_time timestamp without time zone NOT NULL, "
+               "CONSTRAINT show_pkey PRIMARY KEY (id))")
+    op.execute('INSERT INTO show ({0}) SELECT {0} FROM show_partitioned'.format(SHOW_COLUMNS))
+    op.execute('DROP TABLE show_partitioned')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY show.id')
+    add_show_keys('show')
+    # the names c27e5f19a803 and d4e1a9b7c3f6 created, and their downgrades drop
+    add_no_overlap_constraints('show', {'artist_id': 'show_artist_no_overlap',
+                                        'venue_id': 'show_venue_no_overlap'})
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.create_table('show_archive',
+                    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('artist_id', sa.Integer(), nullable=False),
+                    sa.Column('venue_id', sa.Integer(), nullable=False),
+                    sa.Column('start_time', sa.DateTime(), nullable=False),
+                    sa.Column('end_time', sa.DateTime(), nullable=False),
+                    sa.ForeignKeyConstraint(['artist_id'], ['Artist.id'], name='fk_show_archive_artist_id',
+                                            ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['venue_id'], ['Venue.id'], name='fk_show_archive_venue_id',
+                                            ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index('ix_show_archive_artist_time', 'show_archive', ['artist_id', 'start_time'])
+    op.create_index('ix_show_archive_venue_time', 'show_archive', ['venue_id', 'start_time'])
+    if postgres:
+        partition_show()
+    op.execute('CREATE VIEW show_history AS '
+               'SELECT {0} FROM show UNION ALL SELECT {0} FROM show_archive'.format(SHOW_COLUMNS))
+
+
+def downgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.execute('DROP VIEW show_history')
+    op.execute('INSERT INTO show ({0}) SELECT {0} FROM show_archive'.format(SHOW_COLUMNS))
+    if postgres:
+        unpartition_show()
+    op.drop_index('ix_show_archive_venue_time', table_name='show_archive')
+    op.drop_index('ix_show_archive_artist_time', table_name='show_archive')
+    op.drop_table('show_archive')
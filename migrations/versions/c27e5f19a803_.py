@@ -0,0 +1,38 @@
+"""interval indexes and exclusion constraints for show and availability
+
+Revision ID: c27e5f19a803
+Revises: 8a4d6b0c51f2
+Create Date: 2026-10-18 11:48:10.903257
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c27e5f19a803'
+down_revision = '8a4d6b0c51f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_show_artist_time', 'show', ['artist_id', 'start_time', 'end_time'])
+    op.create_index('ix_availability_artist_time', 'availability', ['artist_id', 'start_at', 'end_at'])
+    if op.get_bind().dialect.name == 'postgresql':
+        # one artist can't hold two overlapping shows or availability windows;
+        # the GiST index behind each constraint also serves the && overlap checks.
+        # Fails if overlapping rows already exist - clean those up first.
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        op.execute("ALTER TABLE show ADD CONSTRAINT show_artist_no_overlap "
+                   "EXCLUDE USING gist (artist_id WITH =, tsrange(start_time, end_time, '[]') WITH &&)")
+        op.execute("ALTER TABLE availability ADD CONSTRAINT availability_artist_no_overlap "
+                   "EXCLUDE USING gist (artist_id WITH =, tsrange(start_at, end_at, '[]') WITH &&)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE availability DROP CONSTRAINT availability_artist_no_overlap')
+        op.execute('ALTER TABLE show DROP CONSTRAINT show_artist_no_overlap')
+    op.drop_index('ix_availability_artist_time', table_name='availability')
+    op.drop_index('ix_show_artist_time', table_name='show')
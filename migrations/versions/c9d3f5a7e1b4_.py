@@ -0,0 +1,28 @@
+"""(start_time, id) indexes for the keyset-paginated show listing
+
+Revision ID: c9d3f5a7e1b4
+Revises: b7e2d4f6a9c1
+Create Date: 2026-10-18 19:27:41.306518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d3f5a7e1b4'
+down_revision = 'b7e2d4f6a9c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # on Postgres the index on the partitioned show cascades to every partition,
+    # and the show_history ORDER BY start_time, id becomes a merge of two index scans
+    op.create_index('ix_show_start_id', 'show', ['start_time', 'id'])
+    op.create_index('ix_show_archive_start_id', 'show_archive', ['start_time', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_show_archive_start_id', table_name='show_archive')
+    op.drop_index('ix_show_start_id', table_name='show')
@@ -0,0 +1,31 @@
+"""venue overlap index and exclusion constraint for show
+
+Revision ID: d4e1a9b7c3f6
+Revises: c27e5f19a803
+Create Date: 2026-10-18 13:20:41.118462
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e1a9b7c3f6'
+down_revision = 'c27e5f19a803'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_show_venue_time', 'show', ['venue_id', 'start_time', 'end_time'])
+    if op.get_bind().dialect.name == 'postgresql':
+        # a venue can't host two overlapping shows (btree_gist was enabled by
+        # c27e5f19a803). Fails if double bookings already exist - clean those up first.
+        op.execute("ALTER TABLE show ADD CONSTRAINT show_venue_no_overlap "
+                   "EXCLUDE USING gist (venue_id WITH =, tsrange(start_time, end_time, '[]') WITH &&)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE show DROP CONSTRAINT show_venue_no_overlap')
+    op.drop_index('ix_show_venue_time', table_name='show')
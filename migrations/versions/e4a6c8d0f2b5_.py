@@ -0,0 +1,43 @@
+"""cap shows at 24 hours
+
+Revision ID: e4a6c8d0f2b5
+Revises: c9d3f5a7e1b4
+Create Date: 2026-10-18 21:06:32.415790
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a6c8d0f2b5'
+down_revision = 'c9d3f5a7e1b4'
+branch_labels = None
+depends_on = None
+
+# queries.SHOW_MAX_HOURS: the overlap probes only look SHOW_MAX_HOURS back
+# from a booking, so a longer show would be invisible to them
+MAX_HOURS = 24
+
+
+def upgrade():
+    connection = op.get_bind()
+    postgres = connection.dialect.name == 'postgresql'
+    if postgres:
+        too_long = "end_time - start_time > interval '{} hours'".format(MAX_HOURS)
+    else:
+        too_long = '(julianday(end_time) - julianday(start_time)) * 24 > {}'.format(MAX_HOURS)
+    count = connection.execute(sa.text('SELECT count(*) FROM show WHERE ' + too_long)).scalar()
+    if count:
+        # not shortened or split here: that changes bookings and their counters
+        raise RuntimeError('{} shows last longer than {} hours; shorten or split them, then upgrade again '
+                           '(SELECT * FROM show WHERE {})'.format(count, MAX_HOURS, too_long))
+    if postgres:
+        # inherited by every partition; create_show_partition copies it with LIKE ... INCLUDING CONSTRAINTS
+        op.execute("ALTER TABLE show ADD CONSTRAINT ck_show_max_length "
+                   "CHECK (end_time - start_time <= interval '{} hours')".format(MAX_HOURS))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE show DROP CONSTRAINT ck_show_max_length')
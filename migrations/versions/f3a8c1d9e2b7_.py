@@ -0,0 +1,84 @@
+"""normalized Location table referenced by Artist and Venue
+
+Revision ID: f3a8c1d9e2b7
+Revises: d4e1a9b7c3f6
+Create Date: 2026-10-18 14:05:12.640318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c1d9e2b7'
+down_revision = 'd4e1a9b7c3f6'
+branch_labels = None
+depends_on = None
+
+LOCATED_TABLES = ('Artist', 'Venue')
+
+
+def create_trigram_index(table, column, postgres):
+    if postgres:
+        op.create_index('ix_{}_{}_trgm'.format(table.lower(), column), table, [column],
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+    else:
+        op.create_index('ix_{}_{}_trgm'.format(table.lower(), column), table, [column])
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.create_table('Location',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('city', sa.String(length=120), nullable=False),
+                    sa.Column('state', sa.String(length=120), server_default='', nullable=False),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index('ux_location_city_state', 'Location', [sa.text('lower(city)'), sa.text('lower(state)')],
+                    unique=True)
+    for column in ('city', 'state'):
+        create_trigram_index('Location', column, postgres)
+
+    # one Location per case-insensitive (city, state) in use, keeping one spelling
+    op.execute('INSERT INTO "Location" (city, state) '
+               'SELECT min(city), min(state) FROM ('
+               '  SELECT trim(city) AS city, trim(coalesce(state, \'\')) AS state FROM "Artist"'
+               '  UNION ALL'
+               '  SELECT trim(city), trim(coalesce(state, \'\')) FROM "Venue"'
+               ') AS places WHERE city IS NOT NULL AND city <> \'\' '
+               'GROUP BY lower(city), lower(state)')
+
+    for table in LOCATED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('location_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_{}_location'.format(table.lower()), 'Location',
+                                        ['location_id'], ['id'])
+            batch_op.create_index('ix_{}_location'.format(table.lower()), ['location_id'])
+        op.execute('UPDATE "{0}" SET location_id = (SELECT l.id FROM "Location" l '
+                   'WHERE lower(l.city) = lower(trim("{0}".city)) '
+                   'AND lower(l.state) = lower(trim(coalesce("{0}".state, \'\'))))'.format(table))
+        for column in ('city', 'state'):
+            op.drop_index('ix_{}_{}_trgm'.format(table.lower(), column), table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('city')
+            batch_op.drop_column('state')
+
+
+def downgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table in LOCATED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('city', sa.String(length=120), nullable=True))
+            batch_op.add_column(sa.Column('state', sa.String(length=120), nullable=True))
+        op.execute('UPDATE "{0}" SET '
+                   'city = (SELECT l.city FROM "Location" l WHERE l.id = "{0}".location_id), '
+                   'state = (SELECT l.state FROM "Location" l WHERE l.id = "{0}".location_id)'.format(table))
+        for column in ('city', 'state'):
+            create_trigram_index(table, column, postgres)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index('ix_{}_location'.format(table.lower()))
+            batch_op.drop_constraint('fk_{}_location'.format(table.lower()), type_='foreignkey')
+            batch_op.drop_column('location_id')
+    for column in ('city', 'state'):
+        op.drop_index('ix_location_{}_trgm'.format(column), table_name='Location')
+    op.drop_index('ux_location_city_state', table_name='Location')
+    op.drop_table('Location')
@@ -11,21 +11,58 @@ class Genres(db.Model):
 
 
 artist_genres_map = db.Table('artist_genres_map',
-                             db.Column('artist_id', db.Integer, db.ForeignKey('Artist.id'), primary_key=True),
+                             db.Column('artist_id', db.Integer, db.ForeignKey('Artist.id', ondelete='CASCADE'),
+                                       primary_key=True),
                              db.Column('genres_id', db.Integer, db.ForeignKey('Genres.id'), primary_key=True))
 
 venue_genres_map = db.Table('venue_genres_map',
-                            db.Column('venue_id', db.Integer, db.ForeignKey('Venue.id'), primary_key=True),
+                            db.Column('venue_id', db.Integer, db.ForeignKey('Venue.id', ondelete='CASCADE'),
+                                      primary_key=True),
                             db.Column('genres_id', db.Integer, db.ForeignKey('Genres.id'), primary_key=True))
 
 
-class Venue(db.Model):
+def trigram_indexes(table_name, columns):
+    # pg_trgm GIN indexes so the ILIKE '%term%' search predicates are indexable on
+    # Postgres; other backends get a plain index
+    return tuple(db.Index('ix_{}_{}_trgm'.format(table_name.lower(), column), column,
+                          postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+                 for column in columns)
+
+
+class Location(db.Model):
+    # one row per (city, state), shared by artists and venues; unique
+    # case-insensitively, and that index serves "city, state" lookups
+    __tablename__ = 'Location'
+    __table_args__ = trigram_indexes('Location', ('city', 'state'))
+
+    id = db.Column(db.Integer, primary_key=True)
+    city = db.Column(db.String(120), nullable=False)
+    state = db.Column(db.String(120), nullable=False, default='', server_default='')
+
+
+db.Index('ux_location_city_state', db.func.lower(Location.city), db.func.lower(Location.state), unique=True)
+
+
+class LocatedMixin(object):
+    # read-only city/state of the referenced Location; assign .location to move
+
+    @property
+    def city(self):
+        return self.location.city if self.location is not None else None
+
+    @property
+    def state(self):
+        return self.location.state if self.location is not None else None
+
+
+class Venue(LocatedMixin, db.Model):
     __tablename__ = 'Venue'
+    __table_args__ = trigram_indexes('Venue', ('name',)) + (db.Index('ix_venue_location', 'location_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
-    city = db.Column(db.String(120))
-    state = db.Column(db.String(120))
+    location_id = db.Column(db.Integer, db.ForeignKey('Location.id'))
+    location = db.relationship('Location')
     address = db.Column(db.String(120))
     phone = db.Column(db.String(120))
     genres = db.relationship('Genres', secondary=venue_genres_map,
@@ -35,17 +72,21 @@ class Venue(db.Model):
     website_link = db.Column(db.String(120))
     seeking_talent = db.Column(db.Boolean, default=False)
     seeking_description = db.Column(db.String(500))
+    # denormalized show counters, maintained by counters.py
+    upcoming_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    past_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # TODO: implement any missing fields, as a database migration using Flask-Migrate
 
 
-class Artist(db.Model):
+class Artist(LocatedMixin, db.Model):
     __tablename__ = 'Artist'
+    __table_args__ = trigram_indexes('Artist', ('name',)) + (db.Index('ix_artist_location', 'location_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
-    city = db.Column(db.String(120))
-    state = db.Column(db.String(120))
+    location_id = db.Column(db.Integer, db.ForeignKey('Location.id'))
+    location = db.relationship('Location')
     phone = db.Column(db.String(120))
     genres = db.relationship('Genres', secondary=artist_genres_map, backref=db.backref('artist'))
     image_link = db.Column(db.String(500))
@@ -53,6 +94,9 @@ class Artist(db.Model):
     website_link = db.Column(db.String(120))
     seeking_venue = db.Column(db.Boolean, default=False)
     seeking_description = db.Column(db.String(500))
+    # denormalized show counters, maintained by counters.py
+    upcoming_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    past_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # TODO: implement any missing fields, as a database migration using Flask-Migrate
 
@@ -60,15 +104,77 @@ class Artist(db.Model):
 # TODO Implement Show and Artist models, and complete all model relationships and properties, as a database migration.
 
 class Availability(db.Model):
+    __table_args__ = (db.Index('ix_availability_artist_time', 'artist_id', 'start_at', 'end_at'),)
     id = db.Column(db.Integer, primary_key=True)
-    artist_id = db.Column(db.Integer, db.ForeignKey('Artist.id'), nullable=False)
+    artist_id = db.Column(db.Integer, db.ForeignKey('Artist.id', ondelete='CASCADE'), nullable=False)
     start_at = db.Column(db.DateTime, nullable=False)
     end_at = db.Column(db.DateTime, nullable=False)
 
 
 class Show(db.Model):
+    # live shows; on Postgres range-partitioned by month of start_time (with
+    # primary key (id, start_time)), see show_partitions.py
+    __table_args__ = (db.Index('ix_show_artist_time', 'artist_id', 'start_time', 'end_time'),
+                      db.Index('ix_show_venue_time', 'venue_id', 'start_time', 'end_time'),
+                      # the (start_time, id) keyset of the shows listing
+                      db.Index('ix_show_start_id', 'start_time', 'id'))
     id = db.Column(db.Integer, primary_key=True)
-    artist_id = db.Column(db.Integer, db.ForeignKey('Artist.id'), nullable=False)
-    venue_id = db.Column(db.Integer, db.ForeignKey('Venue.id'), nullable=False)
+    artist_id = db.Column(db.Integer, db.ForeignKey('Artist.id', ondelete='CASCADE'), nullable=False)
+    venue_id = db.Column(db.Integer, db.ForeignKey('Venue.id', ondelete='CASCADE'), nullable=False)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
+    # passive_deletes: the database drops an entity's shows, the ORM never loads them for it
+    artist = db.relationship('Artist', backref=db.backref('shows', lazy=True, passive_deletes=True))
+    venue = db.relationship('Venue', backref=db.backref('shows', lazy=True, passive_deletes=True))
+
+
+# cold storage for shows moved out of `show` by `flask archive-shows`; ids are kept
+show_archive = db.Table('show_archive',
+                        db.Column('id', db.Integer, primary_key=True, autoincrement=False),
+                        db.Column('artist_id', db.Integer, db.ForeignKey('Artist.id', ondelete='CASCADE'),
+                                  nullable=False),
+                        db.Column('venue_id', db.Integer, db.ForeignKey('Venue.id', ondelete='CASCADE'),
+                                  nullable=False),
+                        db.Column('start_time', db.DateTime, nullable=False),
+                        db.Column('end_time', db.DateTime, nullable=False),
+                        db.Index('ix_show_archive_artist_time', 'artist_id', 'start_time'),
+                        db.Index('ix_show_archive_venue_time', 'venue_id', 'start_time'),
+                        db.Index('ix_show_archive_start_id', 'start_time', 'id'))
+
+
+# show_history is a view, so its Table lives outside db.metadata: create_all and
+# autogenerate never treat it as a table. create_all creates the view after
+# the tables instead (migrations create it in b7e2d4f6a9c1)
+SHOW_HISTORY_SELECT = ('SELECT id, artist_id, venue_id, start_time, end_time FROM show '
+                       'UNION ALL SELECT id, artist_id, venue_id, start_time, end_time FROM show_archive')
+
+view_metadata = db.MetaData()
+
+show_history = db.Table('show_history', view_metadata,
+                        db.Column('id', db.Integer, primary_key=True),
+                        db.Column('artist_id', db.Integer, nullable=False),
+                        db.Column('venue_id', db.Integer, nullable=False),
+                        db.Column('start_time', db.DateTime, nullable=False),
+                        db.Column('end_time', db.DateTime, nullable=False))
+
+db.event.listen(db.metadata, 'after_create',
+                db.DDL('CREATE VIEW IF NOT EXISTS show_history AS ' + SHOW_HISTORY_SELECT)
+                .execute_if(dialect='sqlite'))
+db.event.listen(db.metadata, 'after_create',
+                db.DDL('CREATE OR REPLACE VIEW show_history AS ' + SHOW_HISTORY_SELECT)
+                .execute_if(callable_=lambda ddl, target, bind, **kw: bind.dialect.name != 'sqlite'))
+db.event.listen(db.metadata, 'before_drop', db.DDL('DROP VIEW IF EXISTS show_history'))
+
+
+class ShowHistory(db.Model):
+    # read-only: show UNION ALL show_archive, for anything that lists or counts past shows
+    __table__ = show_history
+    artist = db.relationship('Artist', primaryjoin='foreign(ShowHistory.artist_id) == Artist.id', viewonly=True)
+    venue = db.relationship('Venue', primaryjoin='foreign(ShowHistory.venue_id) == Venue.id', viewonly=True)
+
+
+class ShowCounterState(db.Model):
+    # single row: shows starting before rolled_over_at are counted as past
+    __tablename__ = 'show_counter_state'
+    id = db.Column(db.Integer, primary_key=True)
+    rolled_over_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,162 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import functools
+import hashlib
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import request, session, make_response, Response
+from markupsafe import Markup
+
+
+# ----------------------------------------------------------------------------#
+# Backends.
+#
+# Anything with get(key), set(key, value, ttl=None) and delete(key) works.
+# ----------------------------------------------------------------------------#
+
+class LRUBackend(object):
+    # in-process LRU with per-entry TTL; invalidation is local to this process
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisBackend(object):
+    # shared across processes; client is any redis-py compatible client
+
+    def __init__(self, client, prefix='fyyur:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+def create_backend(config):
+    if config.get('RESPONSE_CACHE_BACKEND') == 'redis':
+        import redis
+        return RedisBackend(redis.Redis.from_url(config['RESPONSE_CACHE_REDIS_URL']))
+    return LRUBackend(config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+
+
+# ----------------------------------------------------------------------------#
+# Page cache.
+#
+# Rendered pages are keyed by (kind, entity id, version stamp). Bumping an
+# entity's version orphans its cached pages; responses carry an ETag and
+# Last-Modified so clients can revalidate with a conditional GET.
+# ----------------------------------------------------------------------------#
+
+class PageCache(object):
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        self.ttl = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', False)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 300)
+        self.backend = create_backend(app.config)
+
+    def version(self, kind, entity_id):
+        stamp = self.backend.get('version:{}:{}'.format(kind, entity_id))
+        return stamp if stamp is not None else self.bump(kind, entity_id)
+
+    def bump(self, kind, entity_id):
+        # call after any change that alters the entity's page
+        stamp = uuid.uuid4().hex
+        if self.backend is not None:
+            self.backend.set('version:{}:{}'.format(kind, entity_id), stamp)
+        return stamp
+
+    def bump_many(self, kind, entity_ids):
+        for entity_id in set(entity_ids):
+            self.bump(kind, entity_id)
+
+    def fragment(self, name, build):
+        # rendered HTML fragment, built by build() on a miss
+        if not self.enabled:
+            return Markup(build())
+        key = 'fragment:{}'.format(name)
+        html = self.backend.get(key)
+        if html is None:
+            html = build()
+            self.backend.set(key, html, self.ttl)
+        return Markup(html)
+
+    def invalidate_fragment(self, name):
+        if self.backend is not None:
+            self.backend.delete('fragment:{}'.format(name))
+
+    def cached(self, kind, id_arg):
+        # caches a GET view's 200 responses per entity and answers conditional GETs
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(**kwargs):
+                # pages carrying flashed messages are one-off and never cached
+                if not self.enabled or request.method != 'GET' or session.get('_flashes'):
+                    return view(**kwargs)
+                entity_id = kwargs[id_arg]
+                key = 'page:{}:{}:{}'.format(kind, entity_id, self.version(kind, entity_id))
+                entry = self.backend.get(key)
+                if entry is None:
+                    response = make_response(view(**kwargs))
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    entry = {
+                        'body': body,
+                        'mimetype': response.mimetype,
+                        'etag': hashlib.sha1(body).hexdigest(),
+                        'built_at': datetime.utcnow().replace(microsecond=0),
+                    }
+                    self.backend.set(key, entry, self.ttl)
+                response = Response(entry['body'], mimetype=entry['mimetype'])
+                response.set_etag(entry['etag'])
+                response.last_modified = entry['built_at']
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
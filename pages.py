@@ -0,0 +1,46 @@
+from flask import Blueprint, render_template, request, jsonify, current_app
+
+from app_config import page_cache
+from models import Venue, Artist
+from suggest import SUGGEST_KINDS, suggest_index, ensure_suggest_index
+
+blueprint = Blueprint('pages', __name__)
+
+
+# ----------------------------------------------------------------------------#
+# Controllers.
+# ----------------------------------------------------------------------------#
+
+@blueprint.route('/')
+def index():
+    # the latest-artists/venues panels are cached fragments, so a warm home page runs no SQL
+    recent_artists = page_cache.fragment('recent_artists', lambda: render_template(
+        'pages/recent_artists.html', artists=Artist.query.order_by(Artist.id.desc()).limit(10).all()))
+    recent_venues = page_cache.fragment('recent_venues', lambda: render_template(
+        'pages/recent_venues.html', venues=Venue.query.order_by(Venue.id.desc()).limit(10).all()))
+    return render_template('pages/home.html', recent_artists=recent_artists, recent_venues=recent_venues)
+
+
+@blueprint.route('/search/suggest')
+def search_suggest():
+    # search-as-you-type: top matches for ?q= among artist names, venue names
+    # and cities (?types=artist,venue,city), answered from memory
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', current_app.config['SUGGEST_LIMIT'], type=int),
+                current_app.config['SUGGEST_MAX_LIMIT'])
+    kinds = tuple(kind for kind in request.args.get('types', '').split(',') if kind in SUGGEST_KINDS)
+    ensure_suggest_index()
+    return jsonify({
+        "query": query,
+        "data": suggest_index.search(query, limit, kinds or SUGGEST_KINDS)
+    })
+
+
+@blueprint.app_errorhandler(404)
+def not_found_error(error):
+    return render_template('errors/404.html'), 404
+
+
+@blueprint.app_errorhandler(500)
+def server_error(error):
+    return render_template('errors/500.html'), 500
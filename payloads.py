@@ -0,0 +1,139 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+from models import Venue, Artist, Availability
+from queries import venue_with_timeline, artist_with_timeline, search_page, search_total
+
+# ----------------------------------------------------------------------------#
+# Payloads.
+#
+# Plain dict/list data shared by the HTML views and the JSON API. Datetimes
+# stay datetime objects; templates format them with the `datetime` filter.
+# ----------------------------------------------------------------------------#
+
+
+def search_results(model, search_term, page=1, page_size=20, exact_count_limit=1000):
+    # one page of matches; count is exact up to exact_count_limit, estimated past it
+    rows, has_next = search_page(model, search_term, page, page_size)
+    if not has_next and (rows or page == 1):
+        # the last page: everything before it plus what is on it
+        total, exact = (page - 1) * page_size + len(rows), True
+    else:
+        total, exact = search_total(model, search_term, exact_count_limit)
+    data = []
+    for row in rows:
+        data.append({
+            "id": row.id,
+            "name": row.name,
+            "num_upcoming_shows": row.upcoming_shows_count,
+            "city": row.city,
+            "state": row.state,
+        })
+    return {
+        "count": total,
+        "count_exact": exact,
+        "page": page,
+        "page_size": page_size,
+        "has_next": has_next,
+        "data": data
+    }
+
+
+def venue_search_results(search_term, page=1, page_size=20, exact_count_limit=1000):
+    return search_results(Venue, search_term, page, page_size, exact_count_limit)
+
+
+def artist_search_results(search_term, page=1, page_size=20, exact_count_limit=1000):
+    return search_results(Artist, search_term, page, page_size, exact_count_limit)
+
+
+def venue_detail(venue_id):
+    # None if there is no such venue
+    venue, past_shows, upcoming_shows = venue_with_timeline(venue_id)
+    if venue is None:
+        return None
+    past_shows_list = [venue_show(show) for show in past_shows]
+    upcoming_shows_list = [venue_show(show) for show in upcoming_shows]
+    return {
+        "id": venue.id,
+        "name": venue.name,
+        "genres": [genres.name for genres in venue.genres],
+        "address": venue.address,
+        "city": venue.city,
+        "state": venue.state,
+        "phone": venue.phone,
+        "website": venue.website_link,
+        "facebook_link": venue.facebook_link,
+        "seeking_talent": venue.seeking_talent,
+        "seeking_description": venue.seeking_description,
+        "image_link": venue.image_link,
+        "past_shows": past_shows_list,
+        "upcoming_shows": upcoming_shows_list,
+        "past_shows_count": len(past_shows_list),
+        "upcoming_shows_count": len(upcoming_shows_list),
+    }
+
+
+def venue_show(show):
+    return {
+        "artist_id": show.artist_id,
+        "artist_name": show.artist.name,
+        "artist_image_link": show.artist.image_link,
+        "start_time": show.start_time
+    }
+
+
+def artist_detail(artist_id):
+    # None if there is no such artist
+    artist, past_shows, upcoming_shows = artist_with_timeline(artist_id)
+    if artist is None:
+        return None
+    availability_query = Availability.query.filter(Availability.artist_id == artist.id) \
+        .order_by(Availability.start_at)
+    availability_list = []
+    for availability in availability_query:
+        availability_list.append({
+            "start_at": availability.start_at,
+            "end_at": availability.end_at
+        })
+    past_shows_list = [artist_show(show) for show in past_shows]
+    upcoming_shows_list = [artist_show(show) for show in upcoming_shows]
+    return {
+        "id": artist.id,
+        "name": artist.name,
+        "genres": [genres.name for genres in artist.genres],
+        "city": artist.city,
+        "state": artist.state,
+        "phone": artist.phone,
+        "website": artist.website_link,
+        "facebook_link": artist.facebook_link,
+        "seeking_venue": artist.seeking_venue,
+        "seeking_description": artist.seeking_description,
+        "image_link": artist.image_link,
+        "past_shows": past_shows_list,
+        "availability_list": availability_list,
+        "upcoming_shows": upcoming_shows_list,
+        "past_shows_count": len(past_shows_list),
+        "upcoming_shows_count": len(upcoming_shows_list),
+    }
+
+
+def artist_show(show):
+    return {
+        "venue_id": show.venue_id,
+        "venue_name": show.venue.name,
+        "venue_image_link": show.venue.image_link,
+        "start_time": show.start_time
+    }
+
+
+def show_listing(show):
+    return {
+        "venue_id": show.venue_id,
+        "venue_name": show.venue.name,
+        "artist_id": show.artist_id,
+        "artist_name": show.artist.name,
+        "artist_image_link": show.artist.image_link,
+        "start_time": show.start_time,
+        "end_time": show.end_time
+    }
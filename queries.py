@@ -0,0 +1,345 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import json
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from sqlalchemy import and_, or_, func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app_config import db
+from models import Venue, Artist, Show, ShowHistory, Availability, Location
+
+# longest show accepted; lets overlap probes bound start_time. The forms and
+# the importer enforce it, migration e4a6c8d0f2b5 refuses existing longer
+# shows and adds a CHECK on Postgres - change all of them together
+SHOW_MAX_HOURS = 24
+SHOW_MAX_LENGTH = timedelta(hours=SHOW_MAX_HOURS)
+
+# bookings are made to the second (forms and imports parse %Y-%m-%d %H:%M:%S)
+BOOKING_RESOLUTION = timedelta(seconds=1)
+
+# first key of the pg_advisory_xact_lock(int, int) booking locks
+ARTIST_LOCK = 1
+VENUE_LOCK = 2
+
+def is_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+# ----------------------------------------------------------------------------#
+# Intervals.
+# ----------------------------------------------------------------------------#
+
+def overlap_filter(start_column, end_column, start, end):
+    # rows whose closed [start_column, end_column] interval touches [start, end].
+    # On Postgres this is a tsrange && test served by the GiST exclusion
+    # constraints, elsewhere the composite (owner, start, end) B-tree indexes
+    if is_postgres():
+        return func.tsrange(start_column, end_column, '[]').op('&&')(func.tsrange(start, end, '[]'))
+    return and_(start_column <= end, end_column >= start)
+
+
+def show_overlap_filter(start, end):
+    # overlap_filter for shows, plus a start_time range implied by
+    # SHOW_MAX_LENGTH so the planner prunes the monthly partitions (and the
+    # (owner, start, end) B-tree scans stop early) instead of probing them all
+    return and_(Show.start_time >= start - SHOW_MAX_LENGTH, Show.start_time <= end,
+                overlap_filter(Show.start_time, Show.end_time, start, end))
+
+
+def lock_bookings(artist_ids, venue_ids):
+    # serializes bookings per artist and per venue until the transaction ends;
+    # take it before booking_conflicts so the check and the insert can't
+    # interleave with another booking. The partitions' exclusion constraints
+    # only see their own month, so this is what keeps a show crossing a month
+    # boundary from double-booking. Keys are locked in one global order, so
+    # two bookings never deadlock on each other. Postgres only: SQLite
+    # serializes writers anyway
+    if not is_postgres():
+        return
+    keys = sorted([(ARTIST_LOCK, artist_id) for artist_id in set(artist_ids)] +
+                  [(VENUE_LOCK, venue_id) for venue_id in set(venue_ids)])
+    if keys:
+        db.session.execute(text('SELECT pg_advisory_xact_lock(k.kind, k.id) '
+                                'FROM unnest(CAST(:kinds AS integer[]), CAST(:ids AS integer[])) '
+                                'WITH ORDINALITY AS k(kind, id, n) ORDER BY k.n'),
+                           {'kinds': [kind for kind, _ in keys], 'ids': [key for _, key in keys]})
+
+
+def booking_conflicts(artist_id, venue_id, start, end):
+    # (available, artist_busy, venue_busy) for a show at [start, end], as three
+    # EXISTS probes in one SELECT: one round trip, each probe served by its own
+    # (owner, start, end) index or exclusion constraint
+    available = db.session.query(Availability.id).filter(Availability.artist_id == artist_id,
+                                                         Availability.start_at <= start,
+                                                         Availability.end_at >= end).exists()
+    artist_busy = db.session.query(Show.id).filter(Show.artist_id == artist_id,
+                                                   show_overlap_filter(start, end)).exists()
+    venue_busy = db.session.query(Show.id).filter(Show.venue_id == venue_id,
+                                                  show_overlap_filter(start, end)).exists()
+    return db.session.query(available.label('available'), artist_busy.label('artist_busy'),
+                            venue_busy.label('venue_busy')).one()
+
+
+# ----------------------------------------------------------------------------#
+# Search.
+# ----------------------------------------------------------------------------#
+
+def contains_pattern(term):
+    # ILIKE pattern matching term anywhere, with LIKE wildcards in term escaped
+    term = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return '%' + term + '%'
+
+
+def location_equals(city, state):
+    # case-insensitive equality, served by the unique lower(city), lower(state) index
+    return and_(func.lower(Location.city) == city.strip().lower(),
+                func.lower(Location.state) == state.strip().lower())
+
+
+def search_filter(model, search_term):
+    # "city, state" is an exact (case-insensitive) location lookup joined on the
+    # location_id index; anything else matches the name, city or state, with
+    # the city/state half resolved against the small Location table first
+    data = search_term.split(",")
+    if len(data) > 1:
+        return model.location_id.in_(select([Location.id]).where(location_equals(data[0], data[1])))
+    pattern = contains_pattern(search_term)
+    locations = select([Location.id]).where(or_(Location.city.ilike(pattern, escape='\\'),
+                                                Location.state.ilike(pattern, escape='\\')))
+    return or_(model.name.ilike(pattern, escape='\\'),
+               model.location_id.in_(locations))
+
+
+def search_ordering(model, search_term):
+    # best trigram similarity first on Postgres, alphabetical everywhere else
+    ordering = [model.name, model.id]
+    if is_postgres():
+        relevance = func.greatest(func.similarity(model.name, search_term),
+                                  func.coalesce(func.similarity(Location.city, search_term), 0),
+                                  func.coalesce(func.similarity(Location.state, search_term), 0))
+        ordering.insert(0, relevance.desc())
+    return ordering
+
+
+def search_page(model, search_term, page=1, page_size=20):
+    # one page of matches and whether another follows. Offset paging: the
+    # relevance ordering on Postgres has no stable keyset to resume from
+    rows = db.session.query(model.id, model.name, Location.city, Location.state, model.upcoming_shows_count) \
+        .outerjoin(Location, model.location_id == Location.id) \
+        .filter(search_filter(model, search_term)) \
+        .order_by(*search_ordering(model, search_term)) \
+        .offset((page - 1) * page_size) \
+        .limit(page_size + 1) \
+        .all()
+    return rows[:page_size], len(rows) > page_size
+
+
+def search_total(model, search_term, exact_limit=1000):
+    # (total, exact). COUNT stops after exact_limit + 1 matches, so broad terms
+    # don't count every row; past that Postgres gives the planner's row
+    # estimate and other backends the lower bound
+    matches = db.session.query(model.id).filter(search_filter(model, search_term))
+    capped = matches.limit(exact_limit + 1).subquery()
+    total = db.session.query(func.count()).select_from(capped).scalar()
+    if total <= exact_limit:
+        return total, True
+    if is_postgres():
+        total = max(total, planner_rows(matches.statement))
+    return total, False
+
+
+class Explain(Executable, ClauseElement):
+    # EXPLAIN (FORMAT JSON) <statement>, keeping the statement's bound parameters
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element, compiler, **kw):
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+def planner_rows(statement):
+    plan = db.session.execute(Explain(statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+# ----------------------------------------------------------------------------#
+# Venues.
+# ----------------------------------------------------------------------------#
+
+def venue_areas():
+    # every venue with its (counter column) upcoming show count in one statement,
+    # folded into the city/state "areas" structure used by pages/venues.html.
+    # Areas are Location rows, so same-named cities in different states stay apart
+    rows = db.session.query(Venue.id, Venue.name, Venue.location_id, Location.city, Location.state,
+                            Venue.upcoming_shows_count.label('num_upcoming_shows')) \
+        .outerjoin(Location, Venue.location_id == Location.id) \
+        .order_by(Location.state, Location.city, Venue.location_id, Venue.name) \
+        .all()
+    areas = []
+    area_index = {}
+    for row in rows:
+        key = row.location_id
+        area = area_index.get(key)
+        if area is None:
+            area = {
+                "city": row.city,
+                "state": row.state,
+                "venues": []
+            }
+            area_index[key] = area
+            areas.append(area)
+        area["venues"].append({
+            "id": row.id,
+            "name": row.name,
+            "num_upcoming_shows": row.num_upcoming_shows
+        })
+    return areas
+
+
+def venue_with_timeline(venue_id, now=None):
+    # (venue + location + genres, past shows, upcoming shows) with each show's
+    # artist, in a constant number of queries
+    venue = Venue.query.options(joinedload(Venue.location), selectinload(Venue.genres)).get(venue_id)
+    if venue is None:
+        return None, [], []
+    past_shows, upcoming_shows = split_timeline('venue_id', venue.id, 'artist', now)
+    return venue, past_shows, upcoming_shows
+
+
+# ----------------------------------------------------------------------------#
+# Artists.
+# ----------------------------------------------------------------------------#
+
+def artist_with_timeline(artist_id, now=None):
+    # (artist + location + genres, past shows, upcoming shows) with each show's
+    # venue, in a constant number of queries
+    artist = Artist.query.options(joinedload(Artist.location), selectinload(Artist.genres)).get(artist_id)
+    if artist is None:
+        return None, [], []
+    past_shows, upcoming_shows = split_timeline('artist_id', artist.id, 'venue', now)
+    return artist, past_shows, upcoming_shows
+
+
+# ----------------------------------------------------------------------------#
+# Shows.
+# ----------------------------------------------------------------------------#
+
+def split_timeline(owner_key, owner_id, related, now=None):
+    # (past, upcoming) shows of one artist/venue sorted by start_time, with the
+    # `related` side joined in: one ordered pass over the show_history view
+    # (so archived shows still appear), split at now
+    now = now or datetime.now()
+    shows = ShowHistory.query.options(joinedload(getattr(ShowHistory, related))) \
+        .filter(getattr(ShowHistory, owner_key) == owner_id) \
+        .order_by(ShowHistory.start_time, ShowHistory.id) \
+        .all()
+    past_shows = []
+    upcoming_shows = []
+    for show in shows:
+        if show.start_time < now:
+            past_shows.append(show)
+        else:
+            upcoming_shows.append(show)
+    return past_shows, upcoming_shows
+
+
+def encode_show_cursor(show):
+    # keyset cursor: "<start_time iso>_<id>" of the last row on a page
+    return '{}_{}'.format(show.start_time.isoformat(), show.id)
+
+
+def decode_show_cursor(cursor):
+    start_time, _, show_id = cursor.rpartition('_')
+    return datetime.fromisoformat(start_time), int(show_id)
+
+
+def shows_page(after=None, page_size=50):
+    # one page of shows ordered by (start_time, id), starting strictly after the
+    # cursor, with artist and venue joined in; returns (shows, next_cursor).
+    # Reads show_history, so archived shows are listed too
+    query = ShowHistory.query.options(joinedload(ShowHistory.artist), joinedload(ShowHistory.venue))
+    if after:
+        start_time, show_id = decode_show_cursor(after)
+        query = query.filter(or_(ShowHistory.start_time > start_time,
+                                 and_(ShowHistory.start_time == start_time, ShowHistory.id > show_id)))
+    shows = query.order_by(ShowHistory.start_time, ShowHistory.id).limit(page_size + 1).all()
+    next_cursor = None
+    if len(shows) > page_size:
+        shows = shows[:page_size]
+        next_cursor = encode_show_cursor(shows[-1])
+    return shows, next_cursor
+
+
+# ----------------------------------------------------------------------------#
+# Free slots.
+#
+# Availability minus booked shows, for any number of artists, from two range
+# queries ordered by (artist, start) and one merge-style sweep over them.
+#
+# Shows are closed intervals and booking_conflicts rejects a show that merely
+# touches another, so each show is widened by BOOKING_RESOLUTION before it is
+# subtracted: a slot ends a second before the next show starts and begins a
+# second after the previous one ends, and any returned slot can be booked as is.
+# ----------------------------------------------------------------------------#
+
+def subtract_intervals(windows, busy):
+    # yields the parts of windows not covered by busy; both are iterables of
+    # (start, end) sorted by start. A show may span several windows.
+    busy = iter(busy)
+    current = next(busy, None)
+    for window_start, window_end in windows:
+        cursor = window_start
+        while current is not None and current[0] <= window_end:
+            if current[1] > cursor:
+                if current[0] > cursor:
+                    yield cursor, current[0]
+                cursor = current[1]
+            if current[1] > window_end:
+                # runs into the next window, keep it for that one
+                break
+            current = next(busy, None)
+        if cursor < window_end:
+            yield cursor, window_end
+
+
+def free_slots(start, end, artist_ids=None, min_length=None):
+    # [(artist_id, artist_name, [(free_start, free_end)])] within [start, end]
+    # for artist_ids (every artist with availability in the window if None),
+    # dropping slots shorter than the min_length timedelta
+    windows = db.session.query(Availability.artist_id, Artist.name, Availability.start_at, Availability.end_at) \
+        .join(Artist, Artist.id == Availability.artist_id) \
+        .filter(overlap_filter(Availability.start_at, Availability.end_at, start, end))
+    booked = db.session.query(Show.artist_id, Show.start_time, Show.end_time) \
+        .filter(show_overlap_filter(start, end))
+    if artist_ids is not None:
+        windows = windows.filter(Availability.artist_id.in_(artist_ids))
+        booked = booked.filter(Show.artist_id.in_(artist_ids))
+    windows = windows.order_by(Availability.artist_id, Availability.start_at)
+    booked = groupby(booked.order_by(Show.artist_id, Show.start_time), key=lambda row: row[0])
+
+    results = []
+    busy_artist, busy_rows = next(booked, (None, iter(())))
+    for artist_id, rows in groupby(windows, key=lambda row: row[0]):
+        rows = list(rows)
+        # both streams are ordered by artist, so skip ahead to this artist's shows
+        while busy_artist is not None and busy_artist < artist_id:
+            busy_artist, busy_rows = next(booked, (None, iter(())))
+        busy = [(show_start - BOOKING_RESOLUTION, show_end + BOOKING_RESOLUTION)
+                for _, show_start, show_end in busy_rows] if busy_artist == artist_id else []
+        clipped = [(max(window_start, start), min(window_end, end)) for _, _, window_start, window_end in rows]
+        slots = [slot for slot in subtract_intervals(clipped, busy)
+                 if min_length is None or slot[1] - slot[0] >= min_length]
+        if slots:
+            results.append((artist_id, rows[0][1], slots))
+    return results
@@ -0,0 +1,206 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import bisect
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from app_config import db
+from counters import count_new_shows
+from models import Venue, Artist, Show, Availability
+from queries import overlap_filter, show_overlap_filter, lock_bookings, SHOW_MAX_HOURS, \
+    SHOW_MAX_LENGTH
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+SHOW_IMPORT_FORMATS = ('csv', 'jsonl')
+
+
+# ----------------------------------------------------------------------------#
+# Parsing.
+# ----------------------------------------------------------------------------#
+
+def import_format(filename, fmt=None):
+    # explicit format, else the file extension; None if neither is supported
+    fmt = (fmt or filename.rpartition('.')[2]).lower()
+    return fmt if fmt in SHOW_IMPORT_FORMATS else None
+
+
+def read_show_records(lines, fmt):
+    # yields (line number, raw dict) from CSV (with a header row) or JSONL lines
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'jsonl':
+        for line_num, line in enumerate(lines, 1):
+            if line.strip():
+                try:
+                    yield line_num, json.loads(line)
+                except ValueError:
+                    yield line_num, None
+    else:
+        raise ValueError('Unknown import format: {}'.format(fmt))
+
+
+def parse_show_record(record):
+    # returns (row, None) or (None, reason)
+    if not isinstance(record, dict):
+        return None, 'unreadable record'
+    try:
+        row = {
+            'artist_id': int(record['artist_id']),
+            'venue_id': int(record['venue_id']),
+            'start_time': datetime.strptime(str(record['start_time']).strip(), DATETIME_FORMAT),
+            'end_time': datetime.strptime(str(record['end_time']).strip(), DATETIME_FORMAT),
+        }
+    except KeyError as error:
+        return None, 'missing field {}'.format(error)
+    except (TypeError, ValueError):
+        return None, 'invalid id or datetime'
+    if row['start_time'] > row['end_time']:
+        return None, 'start_time is after end_time'
+    if row['end_time'] - row['start_time'] > SHOW_MAX_LENGTH:
+        return None, 'longer than {} hours'.format(SHOW_MAX_HOURS)
+    return row, None
+
+
+# ----------------------------------------------------------------------------#
+# Set-based validation.
+# ----------------------------------------------------------------------------#
+
+def add_interval(intervals, start, end):
+    # intervals: [(start, end, reach)] sorted by start, where reach is the
+    # latest end among the interval and every one before it. Availability
+    # windows may overlap, and so may shows off Postgres, so the lookups below
+    # go by reach rather than assume the previous interval ends last
+    position = bisect.bisect_right(intervals, (start, end, datetime.max))
+    reach = max(end, intervals[position - 1][2]) if position else end
+    intervals.insert(position, (start, end, reach))
+    for index in range(position + 1, len(intervals)):
+        if intervals[index][2] >= reach:
+            break
+        intervals[index] = intervals[index][:2] + (reach,)
+
+
+def intervals_by_owner(query, start_column):
+    # {artist or venue id: intervals as above} from (owner id, start, end) rows
+    intervals = defaultdict(list)
+    for owner_id, start, end in query.order_by(start_column):
+        add_interval(intervals[owner_id], start, end)
+    return intervals
+
+
+def covering_interval(intervals, start, end):
+    # True if one interval contains [start, end]
+    position = bisect.bisect_right(intervals, (start, datetime.max, datetime.max)) - 1
+    return position >= 0 and intervals[position][2] >= end
+
+
+def overlaps_interval(intervals, start, end):
+    # True if any interval touches [start, end]
+    position = bisect.bisect_right(intervals, (end, datetime.max, datetime.max))
+    return position > 0 and intervals[position - 1][2] >= start
+
+
+def validate_show_rows(rows):
+    # rows: [(line, row)]; returns (accepted rows, [(line, reason)]) after checking
+    # every row against the batch's artists, venues, availability and existing
+    # artist and venue bookings with a fixed number of queries, plus collisions
+    # inside the batch
+    rejected = []
+    if not rows:
+        return [], rejected
+    artist_ids = {row['artist_id'] for _, row in rows}
+    venue_ids = {row['venue_id'] for _, row in rows}
+    window_start = min(row['start_time'] for _, row in rows)
+    window_end = max(row['end_time'] for _, row in rows)
+
+    known_artists = {artist_id for artist_id, in
+                     db.session.query(Artist.id).filter(Artist.id.in_(artist_ids))}
+    known_venues = {venue_id for venue_id, in
+                    db.session.query(Venue.id).filter(Venue.id.in_(venue_ids))}
+    availability = intervals_by_owner(
+        db.session.query(Availability.artist_id, Availability.start_at, Availability.end_at)
+        .filter(Availability.artist_id.in_(artist_ids),
+                overlap_filter(Availability.start_at, Availability.end_at, window_start, window_end)),
+        Availability.start_at)
+    booked = intervals_by_owner(
+        db.session.query(Show.artist_id, Show.start_time, Show.end_time)
+        .filter(Show.artist_id.in_(artist_ids),
+                show_overlap_filter(window_start, window_end)),
+        Show.start_time)
+    venue_booked = intervals_by_owner(
+        db.session.query(Show.venue_id, Show.start_time, Show.end_time)
+        .filter(Show.venue_id.in_(venue_ids),
+                show_overlap_filter(window_start, window_end)),
+        Show.start_time)
+
+    accepted = []
+    for line, row in sorted(rows, key=lambda item: (item[1]['artist_id'], item[1]['start_time'])):
+        artist_id = row['artist_id']
+        if artist_id not in known_artists:
+            rejected.append((line, 'unknown artist {}'.format(artist_id)))
+        elif row['venue_id'] not in known_venues:
+            rejected.append((line, 'unknown venue {}'.format(row['venue_id'])))
+        elif not covering_interval(availability[artist_id], row['start_time'], row['end_time']):
+            rejected.append((line, 'outside artist availability'))
+        elif overlaps_interval(booked[artist_id], row['start_time'], row['end_time']):
+            rejected.append((line, 'artist availability already occupied'))
+        elif overlaps_interval(venue_booked[row['venue_id']], row['start_time'], row['end_time']):
+            rejected.append((line, 'venue already booked'))
+        else:
+            add_interval(booked[artist_id], row['start_time'], row['end_time'])
+            add_interval(venue_booked[row['venue_id']], row['start_time'], row['end_time'])
+            accepted.append((line, row))
+    return accepted, rejected
+
+
+# ----------------------------------------------------------------------------#
+# Import.
+# ----------------------------------------------------------------------------#
+
+def import_shows(records, chunk_size=1000, on_commit=None):
+    # records: iterable of (line, raw dict). Valid rows are inserted with one
+    # executemany per chunk, each chunk in its own transaction that first takes
+    # the booking locks of its artists and venues and then validates it, so a
+    # concurrent booking can't slip in between; on_commit is called with each
+    # committed chunk's rows.
+    # Returns (inserted count, sorted [(line, reason)] rejections).
+    rows = []
+    rejected = []
+    for line, record in records:
+        row, reason = parse_show_record(record)
+        if row is None:
+            rejected.append((line, reason))
+        else:
+            rows.append((line, row))
+
+    inserted = 0
+    for offset in range(0, len(rows), chunk_size):
+        chunk = rows[offset:offset + chunk_size]
+        lock_bookings([row['artist_id'] for _, row in chunk], [row['venue_id'] for _, row in chunk])
+        # earlier chunks are committed by now, so collisions with them show up
+        # as existing bookings
+        accepted, invalid = validate_show_rows(chunk)
+        rejected.extend(invalid)
+        chunk_rows = [row for _, row in accepted]
+        if not chunk_rows:
+            db.session.rollback()
+            continue
+        try:
+            db.session.execute(Show.__table__.insert(), chunk_rows)
+            count_new_shows(chunk_rows)
+            db.session.commit()
+            inserted += len(chunk_rows)
+            if on_commit is not None:
+                on_commit(chunk_rows)
+        except IntegrityError:
+            # an artist or venue was deleted since validation
+            db.session.rollback()
+            rejected.extend((line, 'conflicts with a concurrent change') for line, _ in accepted)
+    db.session.close()
+    return inserted, sorted(rejected)
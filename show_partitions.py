@@ -0,0 +1,142 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import re
+from datetime import datetime
+
+from sqlalchemy import select, text
+
+from app_config import db
+from counters import counter_state
+from models import Show, show_archive
+from queries import is_postgres
+
+SHOW_COLUMNS = 'id, artist_id, venue_id, start_time, end_time'
+
+_partition_name = re.compile(r'^show_p(\d{6})$')
+
+
+# ----------------------------------------------------------------------------#
+# Show partitions and archival.
+#
+# On Postgres `show` is range-partitioned by month of start_time: show_pYYYYMM
+# holds one month and show_default whatever has no partition yet. Run
+# `flask create-show-partitions` monthly to keep SHOW_PARTITION_MONTHS_AHEAD
+# months ready.
+#
+# `flask archive-shows` moves shows older than SHOW_ARCHIVE_AFTER_MONTHS into
+# show_archive: whole partitions are detached and copied on Postgres, other
+# backends move rows. Timelines, /shows and the counters read the
+# show_history view (show UNION ALL show_archive), so history is unchanged.
+#
+# Postgres can't put the overlap exclusion constraints on a partitioned
+# table, so each partition has its own and a show crossing a month boundary
+# is only checked against its own month by the database. Bookings therefore
+# take queries.lock_bookings (per-artist and per-venue advisory locks) before
+# booking_conflicts, which checks every month. Overlap probes bound
+# start_time by SHOW_MAX_LENGTH so they only touch the partitions that can
+# hold an overlapping show; the ck_show_max_length CHECK (copied into each
+# partition) keeps that bound honest.
+# ----------------------------------------------------------------------------#
+
+def month_start(moment):
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return 'show_p{:%Y%m}'.format(month)
+
+
+def show_partitions():
+    # [(name, month)] of the attached monthly partitions, oldest first
+    partitions = []
+    for name, in db.session.execute(text("SELECT c.relname FROM pg_inherits i "
+                                         "JOIN pg_class c ON c.oid = i.inhrelid "
+                                         "WHERE i.inhparent = 'show'::regclass")):
+        match = _partition_name.match(name)
+        if match:
+            partitions.append((name, datetime.strptime(match.group(1), '%Y%m')))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_show_partition(month):
+    # creates and attaches the month's partition, first moving its rows out of
+    # show_default (the attach fails while the default partition holds any)
+    name = partition_name(month)
+    if db.session.execute(text('SELECT to_regclass(:name)'), {'name': name}).scalar() is not None:
+        return False
+    bounds = {'start': month, 'end': add_months(month, 1)}
+    # holds off inserts into show_default until the attach has checked it
+    db.session.execute(text('LOCK TABLE show_default IN SHARE ROW EXCLUSIVE MODE'))
+    db.session.execute(text('CREATE TABLE {} (LIKE show INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'.format(name)))
+    db.session.execute(text('WITH moved AS (DELETE FROM show_default '
+                            'WHERE start_time >= :start AND start_time < :end RETURNING {1}) '
+                            'INSERT INTO {0} ({1}) SELECT {1} FROM moved'.format(name, SHOW_COLUMNS)), bounds)
+    for column in ('artist_id', 'venue_id'):
+        db.session.execute(text("ALTER TABLE {0} ADD CONSTRAINT {0}_{1}_no_overlap EXCLUDE USING gist "
+                                "({1} WITH =, tsrange(start_time, end_time, '[]') WITH &&)".format(name, column)))
+    db.session.execute(text("ALTER TABLE show ATTACH PARTITION {} "
+                            "FOR VALUES FROM ('{:%Y-%m-%d}') TO ('{:%Y-%m-%d}')"
+                            .format(name, bounds['start'], bounds['end'])))
+    return True
+
+
+def create_show_partitions(months_ahead, now=None):
+    # partitions for this month and the next months_ahead, one transaction
+    # each; returns the names created (always none off Postgres)
+    created = []
+    if not is_postgres():
+        return created
+    month = month_start(now or datetime.now())
+    for offset in range(months_ahead + 1):
+        if create_show_partition(add_months(month, offset)):
+            created.append(partition_name(add_months(month, offset)))
+        db.session.commit()
+    return created
+
+
+def archive_cutoff(months, now=None):
+    # start of the month `months` back, but never later than the month of the
+    # counter rollover watermark: roll_over_show_counters only reads `show`,
+    # so every archived show must already be counted as past
+    watermark = counter_state().rolled_over_at
+    cutoff = min(add_months(month_start(now or datetime.now()), -months), month_start(watermark))
+    db.session.commit()
+    return cutoff
+
+
+def archive_shows(months, now=None):
+    # moves shows starting before archive_cutoff() into show_archive; returns
+    # (cutoff, number of shows moved). Each move is its own transaction, so
+    # show_history never sees a show twice or not at all
+    cutoff = archive_cutoff(months, now)
+    moved = 0
+    if is_postgres():
+        for name, month in show_partitions():
+            if add_months(month, 1) > cutoff:
+                break
+            # copy while only writes to the partition wait, then detach: the
+            # exclusive lock on show is held just from the detach to the commit
+            db.session.execute(text('LOCK TABLE {} IN SHARE MODE'.format(name)))
+            moved += db.session.execute(text('INSERT INTO show_archive ({1}) SELECT {1} FROM {0}'
+                                             .format(name, SHOW_COLUMNS))).rowcount
+            db.session.execute(text('ALTER TABLE show DETACH PARTITION {}'.format(name)))
+            db.session.execute(text('DROP TABLE {}'.format(name)))
+            db.session.commit()
+        # stragglers that went to show_default before their month had a partition
+        moved += db.session.execute(text('WITH moved AS (DELETE FROM show_default WHERE start_time < :cutoff '
+                                         'RETURNING {0}) INSERT INTO show_archive ({0}) SELECT {0} FROM moved'
+                                         .format(SHOW_COLUMNS)), {'cutoff': cutoff}).rowcount
+    else:
+        shows = Show.__table__
+        columns = [shows.c[column] for column in show_archive.c.keys()]
+        moved = db.session.execute(show_archive.insert().from_select(
+            show_archive.c.keys(), select(columns).where(shows.c.start_time < cutoff))).rowcount
+        db.session.execute(shows.delete().where(shows.c.start_time < cutoff))
+    db.session.commit()
+    return cutoff, moved
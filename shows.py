@@ -0,0 +1,140 @@
+import io
+import sys
+from datetime import datetime
+from functools import partial
+
+from flask import Blueprint, render_template, request, Response, flash, redirect, url_for, abort, \
+    stream_with_context, jsonify, current_app
+from sqlalchemy.exc import IntegrityError
+
+from app_config import db, post_commit
+from counters import count_new_show
+from instrumentation import StatementBudgetExceeded
+from invalidation import invalidate_show_pages
+from models import Venue, Artist, Show
+from payloads import show_listing
+from queries import shows_page, booking_conflicts, lock_bookings, SHOW_MAX_HOURS, \
+    SHOW_MAX_LENGTH
+from show_import import import_format, read_show_records, import_shows
+
+blueprint = Blueprint('shows', __name__)
+
+
+def stream_template(template_name, **context):
+    # renders the template chunk by chunk so the first bytes go out before the
+    # whole page is built
+    current_app.update_template_context(context)
+    template = current_app.jinja_env.get_template(template_name)
+    return Response(stream_with_context(template.generate(**context)))
+
+
+#  Shows
+#  ----------------------------------------------------------------
+
+@blueprint.route('/shows')
+def shows():
+    # displays list of shows at /shows, one keyset page at a time
+    page_size = min(request.args.get('limit', current_app.config['SHOWS_PAGE_SIZE'], type=int),
+                    current_app.config['SHOWS_MAX_PAGE_SIZE'])
+    if page_size < 1:
+        abort(400)
+    try:
+        show_query, next_cursor = shows_page(after=request.args.get('after'), page_size=page_size)
+    except ValueError:
+        abort(400)
+    show_list = (show_listing(show) for show in show_query)
+    stream = current_app.config['SHOWS_STREAM'] or request.args.get('stream') == '1'
+    if stream:
+        return stream_template('pages/shows.html', shows=show_list, next_cursor=next_cursor,
+                               page_size=page_size)
+    return render_template('pages/shows.html', shows=list(show_list), next_cursor=next_cursor,
+                           page_size=page_size)
+
+
+@blueprint.route('/shows/create')
+def create_shows():
+    # renders form. do not touch.
+    from forms import ShowForm
+    form = ShowForm()
+    return render_template('forms/new_show.html', form=form)
+
+
+@blueprint.route('/shows/create', methods=['POST'])
+def create_show_submission():
+    # called to create new shows in the db, upon submitting new show listing form
+    # TODO: insert form data as a new Show record in the db, instead
+    from forms import ShowForm
+    artist = Artist.query.get(request.form.get('artist_id'))
+    venue = Venue.query.get(request.form.get('venue_id'))
+    start_time_form = request.form.get('start_time')
+    end_time_form = request.form.get('end_time')
+    try:
+        start_time = datetime.strptime(start_time_form, '%Y-%m-%d %H:%M:%S')
+        end_time = datetime.strptime(end_time_form, '%Y-%m-%d %H:%M:%S')
+        if start_time > end_time:
+            flash('Start Time is less than equal to End time')
+        elif end_time - start_time > SHOW_MAX_LENGTH:
+            flash('Shows can last at most {} hours, Show was not listed!'.format(SHOW_MAX_HOURS))
+        else:
+            # held until the commit, so no other booking of the artist or the
+            # venue lands between the check and the insert
+            lock_bookings([artist.id], [venue.id])
+            available, artist_busy, venue_busy = booking_conflicts(artist.id, venue.id, start_time, end_time)
+            if not available:
+                flash('Outside Artist Availability, Show was not listed!')
+            elif artist_busy:
+                flash('Artist Availability already occupied, Show was not listed!')
+            elif venue_busy:
+                flash('Venue is already booked at that time, Show was not listed!')
+            else:
+                show = Show(artist_id=artist.id, venue_id=venue.id, start_time=start_time, end_time=end_time)
+                db.session.add(show)
+                count_new_show(show)
+                post_commit.add(invalidate_show_pages, [{'artist_id': artist.id, 'venue_id': venue.id}])
+                db.session.commit()
+                db.session.close()
+                flash('Show was successfully listed!')
+                return redirect(url_for('pages.index'))
+    except IntegrityError:
+        # the artist or the venue was deleted meanwhile, or a booking made
+        # without lock_bookings hit the exclusion constraints (Postgres)
+        db.session.rollback()
+        flash('Artist or Venue changed in the meantime, Show was not listed!')
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        print(sys.exc_info())
+        flash('Show was not listed!')
+        pass
+    finally:
+        db.session.close()
+    # TODO: on unsuccessful db insert, flash an error instead.
+    # e.g., flash('An error occurred. Show could not be listed.')
+    # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+    form = ShowForm(data={
+        'artist_id': artist.id,
+        'venue_id': venue.id,
+        'start_time': start_time_form,
+        'end_time': end_time_form,
+    })
+    return render_template('forms/new_show.html', form=form)
+
+
+@blueprint.route('/shows/import', methods=['POST'])
+def import_shows_submission():
+    # bulk import of a CSV or JSONL upload ("file" field); reports per-line rejections
+    upload = request.files.get('file')
+    if upload is None:
+        abort(400)
+    fmt = import_format(upload.filename or '', request.form.get('format'))
+    if fmt is None:
+        abort(400)
+    lines = io.TextIOWrapper(upload.stream, encoding='utf-8', newline='')
+    inserted, rejected = import_shows(read_show_records(lines, fmt),
+                                      chunk_size=current_app.config['SHOW_IMPORT_CHUNK_SIZE'],
+                                      on_commit=partial(post_commit.submit, invalidate_show_pages))
+    return jsonify({
+        "inserted": inserted,
+        "rejected": [{"line": line, "reason": reason} for line, reason in rejected]
+    })
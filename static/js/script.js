@@ -2,3 +2,38 @@ window.parseISOString = function parseISOString(s) {
   var b = s.split(/\D+/);
   return new Date(Date.UTC(b[0], --b[1], b[2], b[3], b[4], b[5], b[6]));
 };
+
+// search-as-you-type: fills the navbar search box's datalist from /search/suggest
+document.addEventListener('DOMContentLoaded', function () {
+  var inputs = document.querySelectorAll('input[data-suggest-url]');
+  var datalist = document.getElementById('search-suggestions');
+  Array.prototype.forEach.call(inputs, function (input) {
+    var timer = null;
+    var latest = 0;
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      var query = input.value.trim();
+      if (!query) {
+        datalist.innerHTML = '';
+        return;
+      }
+      timer = setTimeout(function () {
+        var request = ++latest;
+        fetch(input.getAttribute('data-suggest-url') + '&q=' + encodeURIComponent(query))
+          .then(function (response) { return response.json(); })
+          .then(function (payload) {
+            if (request !== latest) {
+              return;
+            }
+            datalist.innerHTML = '';
+            payload.data.forEach(function (match) {
+              var option = document.createElement('option');
+              option.value = match.name;
+              option.label = match.type;
+              datalist.appendChild(option);
+            });
+          });
+      }, 100);
+    });
+  });
+});
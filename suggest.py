@@ -0,0 +1,212 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import bisect
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from app_config import db, page_cache
+from models import Venue, Artist, Location
+
+SUGGEST_KINDS = ('artist', 'venue', 'city')
+
+# ----------------------------------------------------------------------------#
+# Search suggestions.
+#
+# Process-local sorted array of (token, kind, key) tuples answered with
+# bisect, where the tokens of a label are its suffixes starting at each word
+# ("the wild sax band", "wild sax band", ...) so any word prefix matches.
+# Labels are artist names, venue names and "City, ST" for every city in use.
+#
+# Each worker builds the index on its first /search/suggest request, so
+# startup and other pages never pay for it. The create, edit and delete
+# handlers patch it after their commit, which only reaches the worker
+# that handled the request, so workers also rebuild after
+# SUGGEST_INDEX_MAX_AGE seconds. `flask rebuild-suggest-index` bumps a stamp
+# in the page cache backend, so it needs the Redis backend (and refuses to
+# run without it); every worker notices within SUGGEST_INDEX_CHECK_INTERVAL
+# seconds and rebuilds.
+# ----------------------------------------------------------------------------#
+
+_word_start = re.compile(r'\w+')
+
+
+def label_tokens(label):
+    text = label.lower()
+    return {text[match.start():] for match in _word_start.finditer(text)}
+
+
+def city_label(city, state):
+    if not city:
+        return None
+    return '{}, {}'.format(city, state) if state else city
+
+
+class SuggestIndex(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._labels = {}
+        self._city_of = {}
+        self._city_refs = Counter()
+        self.built_at = None
+        self.checked_at = None
+        self.stamp = None
+
+    # callers hold the lock
+    def _add(self, kind, key, label):
+        self._labels[(kind, key)] = label
+        for token in label_tokens(label):
+            bisect.insort(self._keys, (token, kind, key))
+
+    def _remove(self, kind, key):
+        label = self._labels.pop((kind, key), None)
+        if label is None:
+            return
+        for token in label_tokens(label):
+            position = bisect.bisect_left(self._keys, (token, kind, key))
+            if position < len(self._keys) and self._keys[position] == (token, kind, key):
+                del self._keys[position]
+
+    def _release_city(self, owner):
+        label = self._city_of.pop(owner, None)
+        if label is None:
+            return
+        self._city_refs[label] -= 1
+        if self._city_refs[label] <= 0:
+            del self._city_refs[label]
+            self._remove('city', label)
+
+    def put(self, kind, entity_id, name, city, state):
+        # adds or replaces one artist/venue (and its city)
+        with self._lock:
+            self._remove(kind, entity_id)
+            self._release_city((kind, entity_id))
+            if name:
+                self._add(kind, entity_id, name)
+            label = city_label(city, state)
+            if label:
+                self._city_of[(kind, entity_id)] = label
+                self._city_refs[label] += 1
+                if self._city_refs[label] == 1:
+                    self._add('city', label, label)
+
+    def discard(self, kind, entity_id):
+        with self._lock:
+            self._remove(kind, entity_id)
+            self._release_city((kind, entity_id))
+
+    def load(self, entities, stamp=None):
+        # replaces the whole index from (kind, id, name, city, state) rows,
+        # sorting once instead of inserting row by row
+        keys = []
+        labels = {}
+        city_of = {}
+        city_refs = Counter()
+        for kind, entity_id, name, city, state in entities:
+            if name:
+                labels[(kind, entity_id)] = name
+                keys.extend((token, kind, entity_id) for token in label_tokens(name))
+            label = city_label(city, state)
+            if label:
+                city_of[(kind, entity_id)] = label
+                city_refs[label] += 1
+        for label in city_refs:
+            labels[('city', label)] = label
+            keys.extend((token, 'city', label) for token in label_tokens(label))
+        keys.sort()
+        with self._lock:
+            self._keys, self._labels, self._city_of, self._city_refs = keys, labels, city_of, city_refs
+            self.built_at = self.checked_at = time.monotonic()
+            self.stamp = stamp
+
+    def search(self, prefix, limit=10, kinds=SUGGEST_KINDS):
+        # up to limit {type, id, name} matches in token order, one per entity
+        prefix = prefix.strip().lower()
+        results = []
+        if not prefix:
+            return results
+        seen = set()
+        with self._lock:
+            keys = self._keys
+            position = bisect.bisect_left(keys, (prefix,))
+            while position < len(keys) and len(results) < limit:
+                token, kind, key = keys[position]
+                if not token.startswith(prefix):
+                    break
+                position += 1
+                if kind not in kinds or (kind, key) in seen:
+                    continue
+                seen.add((kind, key))
+                results.append({"type": kind, "id": None if kind == 'city' else key,
+                                "name": self._labels[(kind, key)]})
+        return results
+
+    def __len__(self):
+        return len(self._labels)
+
+
+suggest_index = SuggestIndex()
+
+# held by the thread rebuilding suggest_index
+_rebuild_lock = threading.Lock()
+
+
+def rebuild_suggest_index():
+    entities = [('artist',) + tuple(row) for row in
+                db.session.query(Artist.id, Artist.name, Location.city, Location.state)
+                .outerjoin(Location, Artist.location_id == Location.id)]
+    entities.extend(('venue',) + tuple(row) for row in
+                    db.session.query(Venue.id, Venue.name, Location.city, Location.state)
+                    .outerjoin(Location, Venue.location_id == Location.id))
+    suggest_index.load(entities, stamp=page_cache.version('suggest', 'index'))
+    return len(suggest_index)
+
+
+def suggest_index_stale(check_stamp):
+    config = current_app.config
+    if suggest_index.built_at is None or time.monotonic() - suggest_index.built_at > config['SUGGEST_INDEX_MAX_AGE']:
+        return True
+    return check_stamp and page_cache.version('suggest', 'index') != suggest_index.stamp
+
+
+def ensure_suggest_index():
+    # rebuilds on first use, after SUGGEST_INDEX_MAX_AGE, or when the shared
+    # stamp moved. One thread rebuilds at a time: the others keep answering
+    # from the current index, and only wait while there is none yet
+    now = time.monotonic()
+    check_stamp = suggest_index.checked_at is not None and \
+        now - suggest_index.checked_at > current_app.config['SUGGEST_INDEX_CHECK_INTERVAL']
+    if check_stamp:
+        suggest_index.checked_at = now
+    if not suggest_index_stale(check_stamp):
+        return
+    if not _rebuild_lock.acquire(blocking=suggest_index.built_at is None):
+        return
+    try:
+        # another thread may have rebuilt it while this one waited
+        if suggest_index_stale(check_stamp):
+            rebuild_suggest_index()
+    finally:
+        _rebuild_lock.release()
+
+
+# ----------------------------------------------------------------------------#
+# Handler hooks.
+#
+# Called after a successful commit, so rolled back changes never reach the index.
+# ----------------------------------------------------------------------------#
+
+def suggest_put(kind, entity):
+    if suggest_index.built_at is not None:
+        suggest_index.put(kind, entity.id, entity.name, entity.city, entity.state)
+
+
+def suggest_discard(kind, entity_id):
+    if suggest_index.built_at is not None:
+        suggest_index.discard(kind, entity_id)
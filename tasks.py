@@ -0,0 +1,162 @@
+# ----------------------------------------------------------------------------#
+# Imports
+# ----------------------------------------------------------------------------#
+import atexit
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from instrumentation import metrics
+
+metrics.describe('fyyur_task_queue_depth', 'gauge', 'Post-commit tasks waiting for a worker.')
+metrics.describe('fyyur_tasks_total', 'counter', 'Post-commit tasks finished per task and outcome.')
+metrics.describe('fyyur_task_seconds_total', 'counter', 'Time spent running post-commit tasks per task.')
+metrics.describe('fyyur_task_wait_seconds_total', 'counter', 'Time post-commit tasks spent queued per task.')
+metrics.describe('fyyur_task_retries_total', 'counter', 'Failed post-commit task attempts that were retried.')
+metrics.describe('fyyur_task_overflow_total', 'counter',
+                 'Post-commit tasks the committing thread ran because the queue stayed full.')
+
+Task = namedtuple('Task', 'func args kwargs queued_at')
+
+# session.info key holding the tasks waiting for the transaction to commit
+PENDING_KEY = 'post_commit_tasks'
+
+
+# ----------------------------------------------------------------------------#
+# Post-commit tasks.
+#
+# Work a write handler wants done once its transaction is durable (fan-out
+# cache invalidation, notifications, ...) but not while the client waits.
+# post_commit.add() parks a call on the session; the after_commit event hands
+# it to a pool of TASKS_WORKERS threads behind a TASKS_QUEUE_SIZE queue, and a
+# rollback drops it. Failures are retried TASKS_MAX_RETRIES times with
+# exponential backoff. When the queue stays full for TASKS_SUBMIT_TIMEOUT
+# seconds the committing thread waits for the task instead of losing it.
+#
+# Tasks run in an app context with their own db.session and must take plain
+# values, not ORM objects from the committing session. With TASKS_MODE =
+# 'sync' (e.g. in tests) every task has finished by the time commit() returns.
+# ----------------------------------------------------------------------------#
+
+class PostCommitTasks(object):
+
+    def __init__(self, app=None, db=None):
+        self.app = None
+        self.db = None
+        self.mode = 'thread'
+        self._queue = None
+        self._workers = []
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+        self.mode = app.config.get('TASKS_MODE', 'thread')
+        self.num_workers = app.config.get('TASKS_WORKERS', 4)
+        self.submit_timeout = app.config.get('TASKS_SUBMIT_TIMEOUT', 1.0)
+        self.max_retries = app.config.get('TASKS_MAX_RETRIES', 3)
+        self.retry_backoff = app.config.get('TASKS_RETRY_BACKOFF', 0.5)
+        self._queue = queue.Queue(app.config.get('TASKS_QUEUE_SIZE', 1000))
+        if not event.contains(Session, 'after_commit', self._after_commit):
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_transaction_end', self._after_transaction_end)
+
+    def add(self, func, *args, **kwargs):
+        # call before db.session.commit(); func(*args, **kwargs) runs after it
+        self.db.session.info.setdefault(PENDING_KEY, []).append((func, args, kwargs))
+
+    def submit(self, func, *args, **kwargs):
+        # for callers whose transaction already committed
+        task = Task(func, args, kwargs, time.perf_counter())
+        if self.mode == 'sync':
+            self._run_detached(task)
+            return
+        self._ensure_workers()
+        try:
+            self._queue.put(task, timeout=self.submit_timeout)
+        except queue.Full:
+            metrics.inc('fyyur_task_overflow_total')
+            self._run_detached(task)
+            return
+        metrics.set('fyyur_task_queue_depth', self._queue.qsize())
+
+    def join(self):
+        # blocks until every queued task has run
+        if self._queue is not None:
+            self._queue.join()
+
+    def shutdown(self, timeout=5):
+        # lets the queued tasks finish, then stops the workers
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+
+    def _after_commit(self, session):
+        for func, args, kwargs in session.info.pop(PENDING_KEY, ()):
+            self.submit(func, *args, **kwargs)
+
+    def _after_transaction_end(self, session, transaction):
+        # the outermost transaction ended without committing (rollback or close)
+        if transaction.parent is None:
+            session.info.pop(PENDING_KEY, None)
+
+    def _ensure_workers(self):
+        # started on first use, so each forked server process gets its own pool
+        if self._workers:
+            return
+        with self._lock:
+            if self._workers:
+                return
+            for number in range(self.num_workers):
+                worker = threading.Thread(target=self._work, name='post-commit-{}'.format(number), daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            atexit.register(self.shutdown)
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            metrics.set('fyyur_task_queue_depth', self._queue.qsize())
+            try:
+                if task is None:
+                    return
+                self._run(task)
+            finally:
+                self._queue.task_done()
+
+    def _run_detached(self, task):
+        # on a thread of its own so the task gets a fresh scoped session rather
+        # than the one that is committing; the caller waits for it
+        thread = threading.Thread(target=self._run, args=(task,))
+        thread.start()
+        thread.join()
+
+    def _run(self, task):
+        name = getattr(task.func, '__name__', repr(task.func))
+        started = time.perf_counter()
+        metrics.inc('fyyur_task_wait_seconds_total', started - task.queued_at, task=name)
+        with self.app.app_context():
+            for attempt in range(self.max_retries + 1):
+                try:
+                    task.func(*task.args, **task.kwargs)
+                    outcome = 'ok'
+                    break
+                except Exception:
+                    self.db.session.rollback()
+                    if attempt == self.max_retries:
+                        self.app.logger.exception('Post-commit task %s failed after %d attempts', name, attempt + 1)
+                        outcome = 'failed'
+                    else:
+                        metrics.inc('fyyur_task_retries_total', task=name)
+                        time.sleep(self.retry_backoff * 2 ** attempt)
+        metrics.inc('fyyur_tasks_total', task=name, outcome=outcome)
+        metrics.inc('fyyur_task_seconds_total', time.perf_counter() - started, task=name)
@@ -0,0 +1,124 @@
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from app_config import create_app, db
+from commands import initial_genres
+from counters import rebuild_show_counters
+from genre_cache import invalidate_genre_cache
+from locations import resolve_location
+from models import Venue, Artist, Show, Availability
+
+
+# ----------------------------------------------------------------------------#
+# App and database.
+#
+# The app runs on a throwaway SQLite file with post-commit tasks in 'sync'
+# mode and the page cache off, so every request does all of its work (and
+# runs all of its SQL) before the test client returns. Instrumentation is on
+# with no statement budget.
+# ----------------------------------------------------------------------------#
+
+def testing_config(database_uri):
+    settings = {key: getattr(config, key) for key in dir(config) if key.isupper()}
+    settings.update({
+        'SQLALCHEMY_DATABASE_URI': database_uri,
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'RESPONSE_CACHE_ENABLED': False,
+        'TASKS_MODE': 'sync',
+        'INSTRUMENTATION_ENABLED': True,
+    })
+    return type('TestConfig', (object,), settings)
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    database = tmp_path_factory.mktemp('db') / 'fyyur.db'
+    return create_app(testing_config('sqlite:///{}'.format(database)))
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def now():
+    return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def catalog(app, now):
+    # two venues in one city and one in another, three artists; each artist has
+    # an availability window tomorrow evening, one past and one upcoming show
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        invalidate_genre_cache()
+        initial_genres()
+        evening = now.replace(hour=18) + timedelta(days=1)
+        austin = resolve_location('Austin', 'TX')
+        venues = [Venue(name='The Musical Hop', address='1 Main Street', location=austin),
+                  Venue(name='Park Square Live Music & Coffee', address='2 Main Street', location=austin),
+                  Venue(name='The Dueling Pianos Bar', address='3 Main Street',
+                        location=resolve_location('New York', 'NY'))]
+        artists = [Artist(name='Guns N Petals', location=austin),
+                   Artist(name='Matt Quevado', location=austin),
+                   Artist(name='The Wild Sax Band', location=austin)]
+        db.session.add_all(venues + artists)
+        db.session.flush()
+        for index, artist in enumerate(artists):
+            venue = venues[index]
+            db.session.add(Availability(artist_id=artist.id, start_at=evening, end_at=evening + timedelta(hours=6)))
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=evening - timedelta(days=30),
+                                end_time=evening - timedelta(days=30, hours=-2)))
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=evening,
+                                end_time=evening + timedelta(hours=2)))
+        db.session.commit()
+        rebuild_show_counters(now)
+        catalog = {'venue_ids': [venue.id for venue in venues], 'artist_ids': [artist.id for artist in artists],
+                   'evening': evening}
+        db.session.remove()
+    return catalog
+
+
+# ----------------------------------------------------------------------------#
+# Statement counting.
+# ----------------------------------------------------------------------------#
+
+class StatementCounter(object):
+    # statements run by the test's thread, leaving out post-commit tasks
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self.thread_id = threading.get_ident()
+
+    def _count(self, *args):
+        if threading.get_ident() == self.thread_id:
+            self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+@pytest.fixture
+def statements(app, catalog):
+    # with statements as counted: client.get(...); counted.count
+    with app.app_context():
+        engine = db.engine
+    return StatementCounter(engine)
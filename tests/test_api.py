@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+
+def test_api_venues_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.get('/api/venues?fields=id,num_upcoming_shows')
+    assert response.status_code == 200
+    venues = [venue for area in response.get_json()['areas'] for venue in area['venues']]
+    assert sorted(venue['id'] for venue in venues) == [1, 2, 3]
+    assert set(venues[0]) == {'id', 'num_upcoming_shows'}
+    assert counted.count == 1
+
+
+def test_api_shows_pages_through_every_show(client, statements):
+    shows = []
+    after = ''
+    while after is not None:
+        with statements as counted:
+            response = client.get('/api/shows?limit=4&after={}'.format(after))
+        assert response.status_code == 200
+        assert counted.count == 1
+        page = response.get_json()
+        shows.extend(page['data'])
+        after = page['next_cursor']
+    assert len(shows) == 6
+    assert [show['start_time'] for show in shows] == sorted(show['start_time'] for show in shows)
+
+
+def test_api_shows_rejects_bad_cursor(client, catalog):
+    assert client.get('/api/shows?after=garbage').status_code == 400
+
+
+def test_api_artist_matches_the_html_data_path(client, statements, catalog):
+    path = '/api/artists/{}?fields=name,upcoming_shows,past_shows_count'.format(catalog['artist_ids'][0])
+    with statements as counted:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    artist = response.get_json()
+    assert set(artist) == {'name', 'upcoming_shows', 'past_shows_count'}
+    assert artist['name'] == 'Guns N Petals' and artist['past_shows_count'] == 1
+    assert [show['venue_name'] for show in artist['upcoming_shows']] == ['The Musical Hop']
+    assert counted.count == 4
+
+
+def test_api_venue_search_pages(client, catalog):
+    page = client.get('/api/venues/search?search_term=a&limit=2').get_json()
+    assert page['count'] == 3 and page['has_next']
+    assert len(page['data']) == 2
+
+
+def test_api_unknown_venue_is_404(client, catalog):
+    assert client.get('/api/venues/{}'.format(max(catalog['venue_ids']) + 1)).status_code == 404
+
+
+def free_window(catalog):
+    day = catalog['evening'].date()
+    return 'start={}&end={}'.format(day.isoformat(), (day + timedelta(days=1)).isoformat())
+
+
+def test_free_slots_can_be_booked(client, catalog):
+    artist_id = catalog['artist_ids'][0]
+    response = client.get('/api/artists/{}/free?{}'.format(artist_id, free_window(catalog)))
+    assert response.status_code == 200
+    evening = catalog['evening']
+    slots = response.get_json()['free']
+    assert slots == [{'start': (evening + timedelta(hours=2, seconds=1)).isoformat(),
+                      'end': (evening + timedelta(hours=6)).isoformat()}]
+    response = client.post('/shows/create', data={
+        'artist_id': artist_id, 'venue_id': catalog['venue_ids'][1],
+        'start_time': slots[0]['start'].replace('T', ' '), 'end_time': slots[0]['end'].replace('T', ' ')})
+    assert response.status_code == 302
+
+
+def test_free_slots_of_unknown_artist_is_404(client, catalog):
+    path = '/api/artists/{}/free?{}'.format(max(catalog['artist_ids']) + 1, free_window(catalog))
+    assert client.get(path).status_code == 404
@@ -0,0 +1,66 @@
+import re
+from datetime import timedelta
+
+from app_config import db
+from counters import rebuild_show_counters, verify_show_counters
+from models import Show, ShowHistory, show_archive
+from show_partitions import archive_shows
+
+
+def add_old_show(app, catalog, now):
+    # a show of the first artist at the first venue, old enough to archive
+    with app.app_context():
+        start = now - timedelta(days=90)
+        db.session.add(Show(artist_id=catalog['artist_ids'][0], venue_id=catalog['venue_ids'][0],
+                            start_time=start, end_time=start + timedelta(hours=2)))
+        db.session.commit()
+        rebuild_show_counters(now)
+        db.session.remove()
+    return start
+
+
+def archived_count(app):
+    with app.app_context():
+        count = db.session.query(show_archive).count()
+        db.session.remove()
+    return count
+
+
+def test_archive_moves_old_shows_out_of_show(app, catalog, now):
+    old_start = add_old_show(app, catalog, now)
+    with app.app_context():
+        before = [(show.id, show.start_time) for show in ShowHistory.query.order_by(ShowHistory.id)]
+        cutoff, moved = archive_shows(1, now)
+        assert old_start < cutoff <= now
+        assert moved == db.session.query(show_archive).count() >= 1
+        assert Show.query.filter(Show.start_time < cutoff).count() == 0
+        assert [(show.id, show.start_time) for show in ShowHistory.query.order_by(ShowHistory.id)] == before
+        assert verify_show_counters() == []
+        db.session.remove()
+
+
+def test_archived_shows_stay_on_pages(app, client, catalog, now):
+    add_old_show(app, catalog, now)
+    path = '/venues/{}'.format(catalog['venue_ids'][0])
+    before = client.get(path).data
+    with app.app_context():
+        archive_shows(1, now)
+        db.session.remove()
+    assert client.get(path).data == before
+    assert re.search(rb'2 Past\s+Shows', before)
+
+
+def test_archive_never_passes_the_counter_watermark(app, catalog, now):
+    add_old_show(app, catalog, now)
+    with app.app_context():
+        rebuild_show_counters(now - timedelta(days=200))
+        cutoff, moved = archive_shows(1, now)
+        assert moved == 0 and cutoff <= now - timedelta(days=200)
+        db.session.remove()
+
+
+def test_archive_shows_command(app, catalog, now):
+    add_old_show(app, catalog, now)
+    result = app.test_cli_runner().invoke(args=['archive-shows', '--months', '1'])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('Archived {} shows starting before'.format(archived_count(app)))
@@ -0,0 +1,6 @@
+def test_artists_page_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.get('/artists')
+    assert response.status_code == 200
+    assert b'The Wild Sax Band' in response.data
+    assert counted.count == 1
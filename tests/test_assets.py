@@ -0,0 +1,64 @@
+import os
+import shutil
+
+import pytest
+from flask import Flask, url_for
+
+import assets
+from assets import build_assets, init_assets
+
+
+@pytest.fixture
+def static_folder(app, tmp_path):
+    # a copy of static/ for the build to write dist/ into
+    folder = str(tmp_path / 'static')
+    shutil.copytree(app.static_folder, folder, ignore=shutil.ignore_patterns('dist'))
+    return folder
+
+
+def asset_app(static_folder):
+    app = Flask(__name__, static_folder=static_folder)
+    init_assets(app)
+    return app
+
+
+def test_build_writes_hashed_bundles_and_manifest(static_folder):
+    manifest = build_assets(static_folder)
+    css = manifest['bundles/main.css']
+    assert css.startswith('dist/main.') and css.endswith('.css')
+    assert os.path.exists(os.path.join(static_folder, css + '.gz'))
+    assert os.path.exists(os.path.join(static_folder, 'dist', 'manifest.json'))
+
+
+def test_static_urls_resolve_to_hashed_files(static_folder):
+    manifest = build_assets(static_folder)
+    app = asset_app(static_folder)
+    with app.test_request_context():
+        assert url_for('static', filename='bundles/app.js') == '/static/' + manifest['bundles/app.js']
+        assert url_for('static', filename='css/main.css') == '/static/css/main.css'
+
+
+def test_hashed_files_are_served_precompressed_and_immutable(static_folder):
+    manifest = build_assets(static_folder)
+    client = asset_app(static_folder).test_client()
+    response = client.get('/static/' + manifest['bundles/main.css'], headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'Accept-Encoding' in response.headers['Vary']
+    response.close()
+
+
+def test_without_a_manifest_static_urls_are_unchanged(static_folder):
+    app = asset_app(static_folder)
+    with app.test_request_context():
+        assert url_for('static', filename='bundles/main.css') == '/static/bundles/main.css'
+
+
+def test_build_command_warns_about_missing_optional_modules(app, static_folder, monkeypatch):
+    monkeypatch.setattr(app, 'static_folder', static_folder)
+    monkeypatch.setitem(assets.OPTIONAL_MODULES, 'fyyur_no_such_module', ('fyyur-extra', 'nothing extra'))
+    result = app.test_cli_runner().invoke(args=['build-assets'])
+    assert result.exit_code == 0, result.output
+    assert 'bundles/main.css -> dist/main.' in result.output
+    assert 'Warning: fyyur-extra is not installed: nothing extra (pip install fyyur-extra)' in result.output
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from app_config import db
+from models import Venue
+from queries import booking_conflicts
+from test_shows import show_form
+
+
+def upcoming_count(app, venue_id):
+    with app.app_context():
+        count = db.session.query(Venue.upcoming_shows_count).filter(Venue.id == venue_id).scalar()
+        db.session.remove()
+    return count
+
+
+def test_booking_conflicts_checks_availability_and_both_sides(app, catalog):
+    evening = catalog['evening']
+    artist_id, venue_id = catalog['artist_ids'][0], catalog['venue_ids'][1]
+    cases = [
+        ((3, 4), (True, False, False)),
+        ((5, 7), (False, False, False)),
+        # shows are closed intervals: touching the end of one is a conflict
+        ((2, 3), (True, True, True)),
+        ((1, 3), (True, True, True)),
+    ]
+    with app.app_context():
+        for (start, end), expected in cases:
+            conflicts = booking_conflicts(artist_id, venue_id, evening + timedelta(hours=start),
+                                          evening + timedelta(hours=end))
+            assert tuple(conflicts) == expected, (start, end)
+        db.session.remove()
+
+
+def test_create_show_rejects_conflicts(app, client, catalog):
+    cases = [
+        (show_form(catalog, 0, 1, 1, 3), b'Artist Availability already occupied'),
+        (show_form(catalog, 0, 1, 5, 7), b'Outside Artist Availability'),
+        (show_form(catalog, 0, 1, 3, 30), b'Shows can last at most 24 hours'),
+        (show_form(catalog, 1, 0, 1, 3), b'Artist Availability already occupied'),
+        (show_form(catalog, 1, 0, 2.5, 3), b'Venue is already booked'),
+    ]
+    client.post('/shows/create', data=show_form(catalog, 0, 0, 2.5, 3.5))
+    for data, message in cases:
+        response = client.post('/shows/create', data=data, follow_redirects=True)
+        assert message in response.data
+    assert upcoming_count(app, catalog['venue_ids'][1]) == 1
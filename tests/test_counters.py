@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from app_config import db
+from counters import roll_over_show_counters, verify_show_counters
+from models import Venue, Artist
+from test_shows import show_form
+
+
+def counts(app, model, entity_id):
+    with app.app_context():
+        row = db.session.query(model.upcoming_shows_count, model.past_shows_count) \
+            .filter(model.id == entity_id).one()
+        db.session.remove()
+    return tuple(row)
+
+
+def test_create_show_counts_it(app, client, catalog):
+    response = client.post('/shows/create', data=show_form(catalog, 0, 1, 3, 4))
+    assert response.status_code == 302
+    assert counts(app, Venue, catalog['venue_ids'][1]) == (2, 1)
+
+
+def test_rollover_moves_started_shows_to_past(app, catalog):
+    with app.app_context():
+        assert roll_over_show_counters(catalog['evening'] + timedelta(minutes=1)) == 6
+        assert verify_show_counters() == []
+        db.session.remove()
+    assert counts(app, Venue, catalog['venue_ids'][0]) == (0, 2)
+    assert counts(app, Artist, catalog['artist_ids'][2]) == (0, 2)
+
+
+def test_verify_show_counters_reports_drift(app, catalog):
+    venue_id = catalog['venue_ids'][2]
+    with app.app_context():
+        db.session.query(Venue).filter(Venue.id == venue_id).update({Venue.past_shows_count: 5})
+        db.session.commit()
+        assert verify_show_counters() == [('Venue', venue_id, (1, 5), (1, 1))]
+        db.session.remove()
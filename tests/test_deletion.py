@@ -0,0 +1,34 @@
+from app_config import db
+from counters import verify_show_counters
+from deletion import delete_venue_cascade
+from models import Artist, Availability, Show, Venue
+
+
+def test_delete_venue_removes_its_shows(app, client, catalog):
+    venue_id = catalog['venue_ids'][0]
+    assert client.post('/venues/{}'.format(venue_id)).status_code in (200, 302)
+    with app.app_context():
+        assert Show.query.filter_by(venue_id=venue_id).count() == 0
+        assert verify_show_counters() == []
+        db.session.remove()
+
+
+def test_delete_artist_uncounts_its_shows(app, client, catalog):
+    artist_id = catalog['artist_ids'][0]
+    client.post('/artists/{}'.format(artist_id))
+    with app.app_context():
+        assert Artist.query.get(artist_id) is None
+        assert Show.query.filter_by(artist_id=artist_id).count() == 0
+        assert Availability.query.filter_by(artist_id=artist_id).count() == 0
+        db.session.remove()
+    response = client.get('/api/venues/{}'.format(catalog['venue_ids'][0]))
+    assert response.get_json()['upcoming_shows_count'] == 0
+
+
+def test_delete_returns_the_other_side_and_none_when_missing(app, catalog):
+    venue_id = catalog['venue_ids'][2]
+    with app.app_context():
+        assert delete_venue_cascade(venue_id) == [catalog['artist_ids'][2]]
+        assert Venue.query.get(venue_id) is None
+        assert delete_venue_cascade(venue_id) is None
+        db.session.remove()
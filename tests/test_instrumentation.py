@@ -0,0 +1,35 @@
+import pytest
+
+from instrumentation import StatementBudgetExceeded, metrics
+from models import Venue
+from test_venues import venue_form
+
+
+def test_requests_report_statements_in_server_timing(client, catalog):
+    response = client.get('/venues')
+    assert 'db;dur=' in response.headers['Server-Timing']
+    assert 'desc="1 statements"' in response.headers['Server-Timing']
+    assert 'fyyur_sql_statements_total{endpoint="venues.venues"}' in client.get('/metrics').get_data(as_text=True)
+
+
+def test_log_mode_serves_requests_over_budget(app, client, catalog, monkeypatch):
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET', 0)
+    assert client.get('/venues').status_code == 200
+    assert 'fyyur_statement_budget_exceeded_total{endpoint="venues.venues"}' in metrics.render()
+
+
+def test_fail_mode_fails_requests_over_budget(app, client, catalog, monkeypatch):
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET', 0)
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET_ACTION', 'fail')
+    with pytest.raises(StatementBudgetExceeded):
+        client.get('/venues')
+
+
+def test_fail_mode_is_not_swallowed_by_write_handlers(app, client, catalog, monkeypatch):
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET', 1)
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET_ACTION', 'fail')
+    with pytest.raises(StatementBudgetExceeded):
+        client.post('/venues/create', data=venue_form('Over Budget Hall'))
+    monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET', None)
+    with app.app_context():
+        assert Venue.query.filter_by(name='Over Budget Hall').count() == 0
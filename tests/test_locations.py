@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app_config import db
+from locations import resolve_location
+from models import Location, Venue
+from queries import venue_areas
+from test_venues import venue_form
+
+
+def test_resolve_location_reuses_rows_case_insensitively(app, catalog):
+    with app.app_context():
+        austin = resolve_location('Austin', 'TX')
+        assert resolve_location(' austin ', 'tx') is austin
+        assert resolve_location('', 'TX') is None
+        assert Location.query.count() == 2
+        db.session.remove()
+
+
+def test_location_index_rejects_case_variants(app, catalog):
+    with app.app_context():
+        db.session.add(Location(city='AUSTIN', state='tx'))
+        with pytest.raises(IntegrityError):
+            db.session.flush()
+        db.session.rollback()
+        db.session.remove()
+
+
+def test_venue_form_shares_the_location(app, client, catalog):
+    client.post('/venues/create', data=dict(venue_form('The Lowercase Room'), city='austin ', state='tx'))
+    with app.app_context():
+        venue = Venue.query.filter_by(name='The Lowercase Room').one()
+        assert (venue.city, venue.state) == ('Austin', 'TX')
+        db.session.remove()
+
+
+def test_same_city_in_two_states_is_two_areas(app, client, catalog):
+    client.post('/venues/create', data=dict(venue_form('The Other Austin Hall'), state='MN'))
+    with app.app_context():
+        areas = [(area['city'], area['state'], len(area['venues'])) for area in venue_areas()]
+        db.session.remove()
+    assert areas == [('Austin', 'MN', 1), ('New York', 'NY', 1), ('Austin', 'TX', 2)]
+
+
+def test_city_state_search_is_an_exact_location_match(client, catalog):
+    response = client.post('/venues/search', data={'search_term': 'new york, ny'})
+    assert b'The Dueling Pianos Bar' in response.data
+    assert b'The Musical Hop' not in response.data
+    response = client.post('/venues/search', data={'search_term': 'new, ny'})
+    assert b'The Dueling Pianos Bar' not in response.data
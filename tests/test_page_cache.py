@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from app_config import page_cache
+from page_cache import LRUBackend
+from test_shows import show_form
+from test_venues import venue_form
+
+
+@pytest.fixture
+def cached_pages(monkeypatch):
+    # post-commit invalidation runs before the response with TASKS_MODE = 'sync'
+    monkeypatch.setattr(page_cache, 'enabled', True)
+    monkeypatch.setattr(page_cache, 'backend', LRUBackend())
+
+
+def upcoming_heading(response):
+    return int(re.search(rb'(\d+) Upcoming', response.data).group(1))
+
+
+def test_cached_venue_page_runs_no_sql(client, statements, cached_pages, catalog):
+    path = '/venues/{}'.format(catalog['venue_ids'][0])
+    first = client.get(path)
+    with statements as counted:
+        second = client.get(path)
+    assert counted.count == 0
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_cached_artist_page_answers_conditional_get(client, cached_pages, catalog):
+    path = '/artists/{}'.format(catalog['artist_ids'][0])
+    etag = client.get(path).headers['ETag']
+    response = client.get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_new_show_invalidates_cached_venue_page(client, cached_pages, catalog):
+    path = '/venues/{}'.format(catalog['venue_ids'][1])
+    etag = client.get(path).headers['ETag']
+    assert upcoming_heading(client.get(path)) == 1
+    client.post('/shows/create', data=show_form(catalog, 0, 1, 3, 4))
+    response = client.get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert upcoming_heading(response) == 2
+
+
+def test_warm_home_page_runs_no_sql(client, statements, cached_pages):
+    first = client.get('/')
+    with statements as counted:
+        second = client.get('/')
+    assert counted.count == 0
+    assert second.data == first.data
+
+
+def test_home_panels_follow_new_and_deleted_entities(client, cached_pages, catalog):
+    assert b'Guns N Petals' in client.get('/').data
+    client.post('/venues/create', data=venue_form('The Fragment Lounge'))
+    client.post('/artists/{}'.format(catalog['artist_ids'][0]))
+    response = client.get('/')
+    assert b'The Fragment Lounge' in response.data
+    assert b'Guns N Petals' not in response.data
@@ -0,0 +1,53 @@
+from app_config import db
+from models import Venue
+from payloads import search_results, venue_search_results
+
+
+def test_venue_search_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.post('/venues/search', data={'search_term': 'music'})
+    assert response.status_code == 200
+    assert b'The Musical Hop' in response.data
+    assert b'Park Square Live Music &amp; Coffee' in response.data
+    assert b'The Dueling Pianos Bar' not in response.data
+    assert counted.count == 1
+
+
+def test_artist_search_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.post('/artists/search', data={'search_term': 'A'})
+    assert response.status_code == 200
+    assert b'Guns N Petals' in response.data
+    assert b'Matt Quevado' in response.data
+    assert counted.count == 1
+
+
+def test_search_results_carry_upcoming_show_counts(app, catalog):
+    with app.app_context():
+        results = venue_search_results('music')
+        assert [(venue['name'], venue['num_upcoming_shows']) for venue in results['data']] == \
+            [('Park Square Live Music & Coffee', 1), ('The Musical Hop', 1)]
+        db.session.remove()
+
+
+def test_search_totals_are_exact_up_to_the_limit(app, catalog):
+    with app.app_context():
+        first = search_results(Venue, 'a', page=1, page_size=1, exact_count_limit=5)
+        assert (first['count'], first['count_exact'], first['has_next']) == (3, True, True)
+        capped = search_results(Venue, 'a', page=1, page_size=1, exact_count_limit=1)
+        # past the limit SQLite reports the lower bound
+        assert (capped['count'], capped['count_exact']) == (2, False)
+        db.session.remove()
+
+
+def test_last_search_page_needs_no_count(client, statements, app):
+    with statements as counted:
+        response = client.get('/venues/search?search_term=a&page=2&limit=2')
+    assert counted.count == 1
+    assert b'Number of search results for "a": 3</h3>' in response.data
+
+
+def test_estimated_search_total_is_labelled(client, catalog, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_EXACT_COUNT_LIMIT', 1)
+    response = client.get('/artists/search?search_term=a&limit=1')
+    assert b': 2 (estimated)</h3>' in response.data
@@ -0,0 +1,72 @@
+import io
+from datetime import datetime, timedelta
+
+from app_config import db
+from models import Show
+from show_import import add_interval, covering_interval, overlaps_interval, parse_show_record
+from test_shows import show_form
+
+EVENING = datetime(2026, 1, 1, 18)
+
+
+def hours(start, end):
+    return EVENING + timedelta(hours=start), EVENING + timedelta(hours=end)
+
+
+def intervals(*spans):
+    result = []
+    for start, end in spans:
+        add_interval(result, *hours(start, end))
+    return result
+
+
+def test_covering_interval_needs_one_window_to_hold_the_show():
+    # a long window followed by a short one that starts later but ends earlier
+    windows = intervals((4, 5), (0, 6))
+    assert covering_interval(windows, *hours(4.5, 5.5))
+    assert not covering_interval(windows, *hours(5.5, 6.5))
+    # two windows that together span the show don't cover it
+    assert not covering_interval(intervals((0, 2), (2, 4)), *hours(1, 3))
+
+
+def test_overlaps_interval_sees_an_earlier_longer_interval():
+    booked = intervals((0, 10), (1, 2))
+    assert overlaps_interval(booked, *hours(5, 6))
+    assert overlaps_interval(booked, *hours(10, 11))
+    assert not overlaps_interval(booked, *hours(10.5, 11))
+
+
+def test_parse_show_record_rejects_long_and_reversed_shows():
+    record = {'artist_id': '1', 'venue_id': '2', 'start_time': '2026-01-01 18:00:00'}
+    assert parse_show_record(dict(record, end_time='2026-01-01 20:00:00'))[1] is None
+    assert parse_show_record(dict(record, end_time='2026-01-02 19:00:00')) == (None, 'longer than 24 hours')
+    assert parse_show_record(dict(record, end_time='2026-01-01 17:00:00')) == \
+        (None, 'start_time is after end_time')
+    assert parse_show_record({'artist_id': '1'}) == (None, "missing field 'venue_id'")
+
+
+def test_import_shows_reports_rejections(app, client, catalog):
+    rows = [show_form(catalog, 0, 1, 3, 4), show_form(catalog, 0, 2, 3.5, 4.5), show_form(catalog, 0, 1, 3, 30),
+            dict(show_form(catalog, 1, 1, 3, 4), artist_id=99)]
+    lines = ['artist_id,venue_id,start_time,end_time'] + \
+        ['{artist_id},{venue_id},{start_time},{end_time}'.format(**row) for row in rows]
+    response = client.post('/shows/import', content_type='multipart/form-data',
+                           data={'file': (io.BytesIO('\n'.join(lines).encode('utf-8')), 'shows.csv')})
+    assert response.status_code == 200
+    assert response.get_json() == {'inserted': 1, 'rejected': [
+        {'line': 3, 'reason': 'artist availability already occupied'},
+        {'line': 4, 'reason': 'longer than 24 hours'},
+        {'line': 5, 'reason': 'unknown artist 99'},
+    ]}
+    with app.app_context():
+        assert Show.query.count() == 7
+        db.session.remove()
+
+
+def test_import_shows_command_reads_jsonl(app, catalog, tmp_path):
+    path = tmp_path / 'shows.jsonl'
+    path.write_text('{"artist_id": %d, "venue_id": %d, "start_time": "%s", "end_time": "%s"}\n' % tuple(
+        show_form(catalog, 0, 1, 3, 4)[key] for key in ('artist_id', 'venue_id', 'start_time', 'end_time')))
+    result = app.test_cli_runner().invoke(args=['import-shows', str(path)])
+    assert result.exit_code == 0, result.output
+    assert 'Imported 1 shows, rejected 0' in result.output
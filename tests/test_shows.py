@@ -0,0 +1,45 @@
+import re
+from datetime import timedelta
+
+FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def show_form(catalog, artist, venue, start_hours, end_hours):
+    evening = catalog['evening']
+    return {'artist_id': catalog['artist_ids'][artist], 'venue_id': catalog['venue_ids'][venue],
+            'start_time': (evening + timedelta(hours=start_hours)).strftime(FORMAT),
+            'end_time': (evening + timedelta(hours=end_hours)).strftime(FORMAT)}
+
+
+def test_shows_page_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.get('/shows')
+    assert response.status_code == 200
+    assert b'Guns N Petals' in response.data
+    assert counted.count == 1
+
+
+def test_shows_pages_follow_the_next_link(client, catalog):
+    names = []
+    path = '/shows?limit=4'
+    while path:
+        response = client.get(path)
+        assert response.status_code == 200
+        names.extend(re.findall(rb'<h5><a href="/artists/\d+">([^<]+)</a></h5>', response.data))
+        link = re.search(rb'href="(/shows\?[^"]+)"', response.data)
+        path = link.group(1).decode().replace('&amp;', '&') if link else None
+    assert len(names) == 6
+
+
+def test_streamed_shows_page_matches_the_rendered_one(client, statements):
+    with statements as counted:
+        response = client.get('/shows?stream=1')
+        assert response.is_streamed
+        streamed = response.get_data()
+    assert counted.count == 1
+    assert streamed == client.get('/shows').data
+
+
+def test_shows_page_rejects_bad_paging(client, catalog):
+    assert client.get('/shows?limit=0').status_code == 400
+    assert client.get('/shows?after=garbage').status_code == 400
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+import suggest
+from app_config import db, page_cache
+from models import Artist
+from suggest import suggest_index, ensure_suggest_index
+
+
+@pytest.fixture
+def cold_index(catalog, monkeypatch):
+    # every test starts from an index that hasn't been built in this process
+    monkeypatch.setattr(suggest_index, 'built_at', None)
+    monkeypatch.setattr(suggest_index, 'checked_at', None)
+
+
+def suggestions(client, query, types=''):
+    response = client.get('/search/suggest?q={}&types={}'.format(query, types))
+    assert response.status_code == 200
+    return [(item['type'], item['name']) for item in response.get_json()['data']]
+
+
+def add_artist_behind_the_index(app, name):
+    with app.app_context():
+        db.session.add(Artist(name=name))
+        db.session.commit()
+        db.session.remove()
+
+
+def test_suggest_matches_word_prefixes(client, cold_index):
+    assert suggestions(client, 'sax') == [('artist', 'The Wild Sax Band')]
+    assert suggestions(client, 'aus', 'city') == [('city', 'Austin, TX')]
+
+
+def test_created_artist_is_suggested_at_once(client, cold_index):
+    assert suggestions(client, 'zither') == []
+    client.post('/artists/create', data={'name': 'Zither Quartet', 'city': 'Austin', 'state': 'TX',
+                                         'phone': '555-0100', 'genres': ['Jazz']})
+    assert suggestions(client, 'zither') == [('artist', 'Zither Quartet')]
+
+
+def test_index_is_rebuilt_after_max_age(app, client, cold_index, monkeypatch):
+    assert suggestions(client, 'zither') == []
+    add_artist_behind_the_index(app, 'Zither Quartet')
+    assert suggestions(client, 'zither') == []
+    monkeypatch.setitem(app.config, 'SUGGEST_INDEX_MAX_AGE', -1)
+    assert suggestions(client, 'zither') == [('artist', 'Zither Quartet')]
+
+
+def test_index_is_rebuilt_when_the_stamp_moves(app, client, cold_index, monkeypatch):
+    monkeypatch.setitem(app.config, 'SUGGEST_INDEX_CHECK_INTERVAL', -1)
+    assert suggestions(client, 'zither') == []
+    add_artist_behind_the_index(app, 'Zither Quartet')
+    page_cache.bump('suggest', 'index')
+    assert suggestions(client, 'zither') == [('artist', 'Zither Quartet')]
+
+
+def test_stale_index_is_served_while_another_thread_rebuilds(app, client, cold_index, monkeypatch):
+    assert suggestions(client, 'sax') == [('artist', 'The Wild Sax Band')]
+    add_artist_behind_the_index(app, 'Zither Quartet')
+    monkeypatch.setitem(app.config, 'SUGGEST_INDEX_MAX_AGE', -1)
+    rebuilds = []
+    monkeypatch.setattr(suggest, 'rebuild_suggest_index', lambda: rebuilds.append(threading.get_ident()))
+    with suggest._rebuild_lock:
+        with app.app_context():
+            ensure_suggest_index()
+    assert rebuilds == []
+    with app.app_context():
+        ensure_suggest_index()
+    assert rebuilds == [threading.get_ident()]
+
+
+def test_rebuild_command_refuses_the_in_process_backend(app, catalog):
+    result = app.test_cli_runner().invoke(args=['rebuild-suggest-index'])
+    assert result.exit_code != 0
+    assert "RESPONSE_CACHE_BACKEND = 'redis'" in result.output
+
+
+def test_rebuild_command_bumps_the_shared_stamp(app, catalog, monkeypatch):
+    monkeypatch.setitem(app.config, 'RESPONSE_CACHE_BACKEND', 'redis')
+    with app.app_context():
+        stamp = page_cache.version('suggest', 'index')
+    result = app.test_cli_runner().invoke(args=['rebuild-suggest-index'])
+    assert result.exit_code == 0
+    with app.app_context():
+        assert page_cache.version('suggest', 'index') != stamp
@@ -0,0 +1,66 @@
+import pytest
+
+from app_config import db, post_commit
+from instrumentation import metrics
+from models import Venue
+
+
+@pytest.fixture
+def calls(app, catalog):
+    return []
+
+
+def test_tasks_run_after_commit(app, calls):
+    with app.app_context():
+        post_commit.add(calls.append, 'committed')
+        assert calls == []
+        db.session.commit()
+        assert calls == ['committed']
+        db.session.remove()
+
+
+def test_tasks_are_dropped_on_rollback(app, calls):
+    with app.app_context():
+        post_commit.add(calls.append, 'rolled back')
+        db.session.rollback()
+        db.session.commit()
+        db.session.remove()
+    assert calls == []
+
+
+def test_tasks_get_their_own_session(app, calls):
+    def count_venues():
+        calls.append(Venue.query.count())
+    with app.app_context():
+        db.session.add(Venue(name='The Task Hall'))
+        post_commit.add(count_venues)
+        db.session.commit()
+        db.session.remove()
+    assert calls == [4]
+
+
+def test_failed_tasks_are_retried(app, calls, monkeypatch):
+    monkeypatch.setattr(post_commit, 'retry_backoff', 0)
+
+    def flaky():
+        calls.append('attempt')
+        if len(calls) < 3:
+            raise RuntimeError('not yet')
+    with app.app_context():
+        post_commit.add(flaky)
+        db.session.commit()
+        db.session.remove()
+    assert calls == ['attempt'] * 3
+    rendered = metrics.render()
+    assert 'fyyur_task_retries_total{task="flaky"} 2.0' in rendered
+    assert 'fyyur_tasks_total{outcome="ok",task="flaky"} 1.0' in rendered
+
+
+def test_thread_mode_runs_tasks_on_the_pool(app, calls, monkeypatch):
+    monkeypatch.setattr(post_commit, 'mode', 'thread')
+    with app.app_context():
+        post_commit.add(calls.append, 'queued')
+        db.session.commit()
+        db.session.remove()
+    post_commit.join()
+    assert calls == ['queued']
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from app_config import db
+from models import Show
+from queries import venue_with_timeline, artist_with_timeline
+
+
+def add_upcoming_shows(app, catalog, count):
+    # count more upcoming shows of the first artist, spread over the venues
+    with app.app_context():
+        for day in range(2, count + 2):
+            start = catalog['evening'] + timedelta(days=day)
+            db.session.add(Show(artist_id=catalog['artist_ids'][0], venue_id=catalog['venue_ids'][day % 3],
+                                start_time=start, end_time=start + timedelta(hours=2)))
+        db.session.commit()
+        db.session.remove()
+
+
+def test_timelines_split_at_now_in_start_order(app, catalog, now):
+    add_upcoming_shows(app, catalog, 3)
+    with app.app_context():
+        venue, past_shows, upcoming_shows = venue_with_timeline(catalog['venue_ids'][0], now)
+        assert [show.artist.name for show in past_shows] == ['Guns N Petals']
+        assert len(upcoming_shows) == 2
+        artist, past_shows, upcoming_shows = artist_with_timeline(catalog['artist_ids'][0], now)
+        assert [show.start_time < now for show in past_shows] == [True]
+        starts = [show.start_time for show in upcoming_shows]
+        assert starts == sorted(starts) and len(starts) == 4 and starts[0] >= now
+        assert upcoming_shows[0].venue.name == 'The Musical Hop'
+        db.session.remove()
+
+
+def test_venue_page_statements_do_not_grow_with_shows(app, client, statements, catalog):
+    path = '/venues/{}'.format(catalog['venue_ids'][0])
+    with statements as counted:
+        assert client.get(path).status_code == 200
+    before = counted.count
+    add_upcoming_shows(app, catalog, 6)
+    with statements as counted:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert counted.count == before == 3
+
+
+def test_artist_page_statements_do_not_grow_with_shows(app, client, statements, catalog):
+    path = '/artists/{}'.format(catalog['artist_ids'][0])
+    with statements as counted:
+        assert client.get(path).status_code == 200
+    before = counted.count
+    add_upcoming_shows(app, catalog, 5)
+    with statements as counted:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert counted.count == before == 4
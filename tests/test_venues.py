@@ -0,0 +1,36 @@
+from queries import venue_areas
+
+
+def venue_form(name):
+    return {'name': name, 'city': 'Austin', 'state': 'TX', 'address': '4 Main Street', 'phone': '555-0100',
+            'genres': ['Jazz'], 'facebook_link': 'https://www.facebook.com/venue'}
+
+
+def test_venue_areas_groups_venues_by_location(app, catalog):
+    with app.app_context():
+        areas = venue_areas()
+    assert [(area['city'], area['state']) for area in areas] == [('New York', 'NY'), ('Austin', 'TX')]
+    austin = areas[1]['venues']
+    assert [venue['name'] for venue in austin] == ['Park Square Live Music & Coffee', 'The Musical Hop']
+    assert [venue['num_upcoming_shows'] for venue in austin] == [1, 1]
+
+
+def test_venues_page_runs_one_statement(client, statements):
+    with statements as counted:
+        response = client.get('/venues')
+    assert response.status_code == 200
+    assert b'The Dueling Pianos Bar' in response.data
+    assert counted.count == 1
+
+
+def test_venues_page_statements_do_not_grow_with_venues(client, statements):
+    for number in range(5):
+        client.post('/venues/create', data=dict(venue_form('Venue {}'.format(number)), city='City {}'.format(number)))
+    with statements as counted:
+        response = client.get('/venues')
+    assert b'City 4' in response.data
+    assert counted.count == 1
+
+
+def test_missing_venue_is_404(client, catalog):
+    assert client.get('/venues/{}'.format(max(catalog['venue_ids']) + 1)).status_code == 404
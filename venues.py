@@ -0,0 +1,187 @@
+import sys
+
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort, current_app
+
+from app_config import db, page_cache, post_commit
+from deletion import delete_venue_cascade
+from genre_cache import resolve_genres
+from instrumentation import StatementBudgetExceeded
+from invalidation import invalidate_venue_listings
+from locations import resolve_location
+from models import Venue
+from payloads import venue_search_results, venue_detail
+from queries import venue_areas
+from suggest import suggest_put, suggest_discard
+
+blueprint = Blueprint('venues', __name__)
+
+
+#  Venues
+#  ----------------------------------------------------------------
+
+@blueprint.route('/venues')
+def venues():
+    # num_upcoming_shows is aggregated in the same statement as the venue list
+    venue_list = venue_areas()
+    return render_template('pages/venues.html', areas=venue_list)
+
+
+@blueprint.route('/venues/search', methods=['GET', 'POST'])
+def search_venues():
+    # TODO: implement search on artists with partial string search. Ensure it is case-insensitive.
+    # search for Hop should return "The Musical Hop".
+    # search for "Music" should return "The Musical Hop" and "Park Square Live Music & Coffee"
+    # the form POSTs the first page, the pager links GET the others
+    search_term = request.values.get('search_term', '')
+    page = request.values.get('page', 1, type=int)
+    page_size = min(request.values.get('limit', current_app.config['SEARCH_PAGE_SIZE'], type=int),
+                    current_app.config['SEARCH_MAX_PAGE_SIZE'])
+    if page < 1 or page_size < 1:
+        abort(400)
+    response = venue_search_results(search_term, page, page_size, current_app.config['SEARCH_EXACT_COUNT_LIMIT'])
+    return render_template('pages/search_venues.html', results=response, search_term=search_term)
+
+
+@blueprint.route('/venues/<int:venue_id>')
+@page_cache.cached('venue', 'venue_id')
+def show_venue(venue_id):
+    # shows the venue page with the given venue_id
+    # TODO: replace with real venue data from the venues table, using venue_id
+    venue = venue_detail(venue_id)
+    if venue is None:
+        abort(404)
+    return render_template('pages/show_venue.html', venue=venue)
+
+
+#  Create Venue
+#  ----------------------------------------------------------------
+
+@blueprint.route('/venues/create', methods=['GET'])
+def create_venue_form():
+    from forms import VenueForm
+    form = VenueForm()
+    return render_template('forms/new_venue.html', form=form)
+
+
+@blueprint.route('/venues/create', methods=['POST'])
+def create_venue_submission():
+    # TODO: insert form data as a new Venue record in the db, instead
+    # TODO: modify data to be the data object returned from db insertion
+    try:
+        venue = Venue(name=request.form.get('name'),
+                      location=resolve_location(request.form.get('city'), request.form.get('state')),
+                      address=request.form.get('address'),
+                      phone=request.form.get('phone'),
+                      facebook_link=request.form.get('facebook_link'),
+                      image_link=request.form.get('image_link'),
+                      website_link=request.form.get('website_link'),
+                      seeking_talent=True if request.form.get('seeking_talent') else False,
+                      seeking_description=request.form.get('seeking_description'))
+        venue.genres = resolve_genres(request.form.getlist('genres'))
+        db.session.add(venue)
+        db.session.commit()
+        page_cache.invalidate_fragment('recent_venues')
+        suggest_put('venue', venue)
+        # on successful db insert, flash success
+        flash('Venue ' + request.form['name'] + ' was successfully listed!')
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        # TODO: on unsuccessful db insert, flash an error instead.
+        # e.g., flash('An error occurred. Venue ' + data.name + ' could not be listed.')
+        flash('An error occurred. Venue ' + request.form.get('name') + ' could not be listed.')
+        # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+    finally:
+        db.session.close()
+    return render_template('pages/home.html')
+
+
+@blueprint.route('/venues/<int:venue_id>', methods=['POST'])
+def delete_venue(venue_id):
+    error = False
+    # shows and genre rows go with bulk deletes, see deletion.py
+    try:
+        artist_ids = delete_venue_cascade(venue_id)
+        if artist_ids is not None:
+            page_cache.bump('venue', venue_id)
+            post_commit.submit(invalidate_venue_listings, venue_id, artist_ids)
+            suggest_discard('venue', venue_id)
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        error = True
+        db.session.rollback()
+        print(sys.exc_info())
+    finally:
+        db.session.close()
+    if error:
+        abort(400)
+    if artist_ids is None:
+        abort(404)
+    return redirect(url_for('pages.index'))
+
+
+#  Update
+#  ----------------------------------------------------------------
+
+@blueprint.route('/venues/<int:venue_id>/edit', methods=['GET'])
+def edit_venue(venue_id):
+    from forms import VenueForm
+    venue = Venue.query.get(venue_id)
+    venue_genres_query = list(venue.genres)
+    venue_genres_list = []
+    for genres in venue_genres_query:
+        venue_genres_list.append(genres.name)
+    venue_form_data = {
+        "id": venue.name,
+        "name": venue.name,
+        "genres": venue_genres_list,
+        "address": venue.address,
+        "city": venue.city,
+        "state": venue.state,
+        "phone": venue.phone,
+        "website": venue.website_link,
+        "facebook_link": venue.facebook_link,
+        "seeking_talent": venue.seeking_talent,
+        "seeking_description": venue.seeking_description,
+        "image_link": venue.image_link
+    }
+    form = VenueForm(data=venue_form_data)
+    # TODO: populate form with values from venue with ID <venue_id>
+    return render_template('forms/edit_venue.html', form=form, venue=venue)
+
+
+@blueprint.route('/venues/<int:venue_id>/edit', methods=['POST'])
+def edit_venue_submission(venue_id):
+    # TODO: take values from the form submitted, and update existing
+    # venue record with ID <venue_id> using the new attributes
+    try:
+        venue = Venue.query.get(venue_id)
+        venue.name = request.form.get('name')
+        venue.address = request.form.get('name')
+        venue.location = resolve_location(request.form.get('city'), request.form.get('state'))
+        venue.phone = request.form.get('phone')
+        venue.facebook_link = request.form.get('facebook_link')
+        venue.image_link = request.form.get('image_link')
+        venue.website_link = request.form.get('website_link')
+        venue.seeking_talent = True if request.form.get('seeking_talent') else False
+        venue.seeking_description = request.form.get('seeking_description')
+        venue.genres = resolve_genres(request.form.getlist('genres'))
+        post_commit.add(invalidate_venue_listings, venue_id)
+        db.session.commit()
+        page_cache.bump('venue', venue_id)
+        suggest_put('venue', venue)
+    except StatementBudgetExceeded:
+        db.session.rollback()
+        raise
+    except:
+        # TODO: on unsuccessful db insert, flash an error instead.
+        print(sys.exc_info())
+        # e.g., flash('An error occurred. Venue ' + data.name + ' could not be listed.')
+        # flash('An error occurred. Venue ' + request.form.get('name') + ' could not be listed.')
+        # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+    finally:
+        db.session.close()
+    return redirect(url_for('venues.show_venue', venue_id=venue_id))